@@ -1,17 +1,98 @@
-from fastapi import APIRouter
-from typing import Dict
+import json
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, List, Optional
 
-from app.core.exchange import get_exchange
-from app.core.market_data import MarketDataService
-from app.strategy.alignment import evaluate_alignment
-from app.strategy.index_filter import index_confirms_pair
-from app.strategy.candles import validate_entry_candle
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+
+from app.core.timeframes import TIMEFRAME_SECONDS, current_bar
+from app.core.warmup import wait_until_warm
+from app.schemas import BatchRequest, SignalResponse
+
+# The decision engine (pandas / numpy / strategy) is imported inside the
+# handlers, so importing the app stays cheap; see app.core.warmup.
 
 router = APIRouter()
 
 
-@router.get("/")
-def get_signal() -> Dict:
+# =========================
+# HTTP caching
+# =========================
+
+def decision_validators(
+    entry: Dict,
+    timeframes: List[str],
+    now: Optional[float] = None,
+) -> Dict:
+    """
+    ETag / Last-Modified for a decision entry (see get_decision_entry).
+
+    Both were fixed when the decision was evaluated and travel with it
+    through the shared cache, so every worker answers with the same
+    validators and a conditional request needs no evaluation.
+    """
+    now = time.time() if now is None else now
+    fastest_tf = min(timeframes, key=TIMEFRAME_SECONDS.__getitem__)
+    max_age = current_bar(fastest_tf, now) + TIMEFRAME_SECONDS[fastest_tf] - int(now)
+
+    validators = {
+        "ETag": f'"{entry["etag"]}"',
+        "Cache-Control": f"private, max-age={max(0, max_age)}",
+        "_last_modified": entry["last_modified"],
+    }
+
+    if validators["_last_modified"] is not None:
+        validators["Last-Modified"] = formatdate(validators["_last_modified"], usegmt=True)
+
+    return validators
+
+
+def is_not_modified(request: Request, validators: Dict) -> bool:
+    """
+    RFC 9110: If-None-Match wins over If-Modified-Since.
+    """
+    if_none_match = request.headers.get("if-none-match")
+
+    if if_none_match is not None:
+        tags = [t.strip() for t in if_none_match.split(",")]
+        # Weak comparison: W/"x" matches "x"
+        etag = validators["ETag"].removeprefix("W/")
+        return "*" in tags or any(t.removeprefix("W/") == etag for t in tags)
+
+    if_modified_since = request.headers.get("if-modified-since")
+
+    if if_modified_since is not None:
+        if validators["_last_modified"] is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return validators["_last_modified"] <= since
+
+    return False
+
+
+def require_warm():
+    """
+    Requests must not evaluate while warm-up still loads the engine or
+    restores state into the buffers they read: 503 if it outlasts the wait.
+    """
+    if not wait_until_warm():
+        raise HTTPException(
+            status_code=503,
+            detail="Warming up, retry shortly",
+            headers={"Retry-After": "5"},
+        )
+
+
+# =========================
+# ROUTES
+# =========================
+
+@router.get("/", response_model=SignalResponse)
+def get_signal(request: Request) -> Response:
     # =========================
     # Configuration (temporary)
     # =========================
@@ -19,103 +100,56 @@ def get_signal() -> Dict:
     index_symbol = "DXY"   # handled by exchange adapter
     timeframes = ["1h", "30m", "15m"]
 
-    market_data = MarketDataService()
+    require_warm()
 
-    # =========================
-    # 1️⃣ Pair structure
-    # =========================
-    pair_structures = market_data.evaluate_structure_multi_tf(
-        symbol=symbol,
-        timeframes=timeframes,
-        failure_validator=lambda idx: True,  # already validated in Phase 2A
-    )
+    from app.core.decision import get_decision_entry, peek_decision_entry
 
-    pair_alignment = evaluate_alignment(pair_structures)
+    # A decision already cached for this bar answers conditional
+    # requests before anything is evaluated
+    entry = peek_decision_entry(symbol, index_symbol, timeframes)
 
-    if not pair_alignment["aligned"]:
-        return {
-            "trade_allowed": False,
-            "reason": "Pair structure not aligned",
-            "details": pair_alignment,
-        }
+    if entry is None:
+        # Concurrent polls share one in-flight evaluation (and, with the
+        # shared cache, one per bar)
+        entry = get_decision_entry(
+            symbol=symbol,
+            index_symbol=index_symbol,
+            timeframes=timeframes,
+        )
 
-    # =========================
-    # 2️⃣ Index structure
-    # =========================
-    index_structures = market_data.evaluate_structure_multi_tf(
-        symbol=index_symbol,
-        timeframes=timeframes,
-        failure_validator=lambda idx: True,
-    )
+    validators = decision_validators(entry, timeframes)
+    headers = {k: v for k, v in validators.items() if not k.startswith("_")}
 
-    index_alignment = evaluate_alignment(index_structures)
+    if is_not_modified(request, validators):
+        return Response(status_code=304, headers=headers)
 
-    index_check = index_confirms_pair(
-        symbol=symbol,
-        pair_alignment=pair_alignment,
-        index_alignment=index_alignment,
+    # pydantic-core serializes straight to JSON bytes, skipping
+    # FastAPI's jsonable_encoder pass over the dict
+    body = SignalResponse.model_validate(entry["decision"]).model_dump_json(
+        exclude_unset=True
     )
 
-    if not index_check["allowed"]:
-        return {
-            "trade_allowed": False,
-            "reason": index_check["reason"],
-        }
+    return Response(content=body, media_type="application/json", headers=headers)
 
-    # =========================
-    # 3️⃣ Select dominant zone
-    # =========================
-    # Take the first valid zone from aligned TFs
-    direction = pair_alignment["direction"]
-    aligned_tfs = pair_alignment["valid_timeframes"]
-
-    zone = None
-    zone_tf = None
-
-    for tf in aligned_tfs:
-        result = pair_structures[tf]
-        if result.zone:
-            zone = result.zone
-            zone_tf = tf
-            break
-
-    if not zone:
-        return {
-            "trade_allowed": False,
-            "reason": "No valid structure zone",
-        }
 
-    # =========================
-    # 4️⃣ Fetch candles for entry check
-    # =========================
-    df = market_data.fetch_ohlcv(symbol, zone_tf)
-    current_idx = len(df) - 1
-
-    entry_ok = validate_entry_candle(
-        df=df,
-        idx=current_idx,
-        direction=direction,
-        zone=(zone.lower, zone.upper),
-    )
+@router.post("/batch")
+def post_signal_batch(request: BatchRequest) -> StreamingResponse:
+    """
+    Evaluate many jobs on a process pool.
+    Streams one JSON object per line (NDJSON) as each job finishes.
+    """
+    from app.core.batch import job_from_dict, run_batch
 
-    if not entry_ok:
-        return {
-            "trade_allowed": False,
-            "reason": "No valid entry candle",
-        }
+    require_warm()
 
-    # =========================
-    # ✅ FINAL DECISION
-    # =========================
-    return {
-        "trade_allowed": True,
-        "direction": direction,
-        "zone": {
-            "lower": zone.lower,
-            "upper": zone.upper,
-            "timeframe": zone_tf,
-        },
-        "entry_index": current_idx,
-        "note": "Phase 2C decision only — no execution",
-    }
+    jobs = [job_from_dict(job.model_dump()) for job in request.jobs]
+
+    def stream():
+        for result in run_batch(
+            jobs,
+            max_workers=request.max_workers,
+            history=request.history,
+        ):
+            yield json.dumps(result, default=str) + "\n"
 
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
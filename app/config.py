@@ -0,0 +1,79 @@
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+
+@dataclass(frozen=True)
+class Settings:
+    # Cross-worker cache (SQLite file shared by every uvicorn worker)
+    shared_cache_enabled: bool
+    shared_cache_path: str
+    shared_cache_lock_ttl: float
+    shared_cache_stale_ttl: float
+
+    # Forex provider: "live" | "record" | "replay"
+    forex_provider_mode: str
+    twelve_data_api_key: Optional[str]
+    twelve_data_base_url: str
+    forex_record_dir: str
+    replay_latency_ms: float
+    replay_error_rate: float
+    replay_seed: int
+
+    # State snapshots (candles, zones, decision history); each worker
+    # writes <stem>.<pid><suffix> next to state_snapshot_path
+    state_enabled: bool
+    state_snapshot_path: str
+    state_snapshot_interval: float
+
+    # Live tick feed for intrabar entries: "" (off) | "replay" | "ccxt".
+    # Every worker runs its own feed for each of tick_symbols; replay
+    # reads <tick_replay_dir>/<EURUSD>.csv, ccxt streams tick_exchange
+    tick_feed: str
+    tick_symbols: List[str]
+    tick_replay_dir: str
+    tick_exchange: str
+
+
+def _env_bool(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Read settings from the environment (and .env) once per process.
+    """
+    load_dotenv()
+
+    return Settings(
+        shared_cache_enabled=_env_bool("SHARED_CACHE_ENABLED", "1"),
+        shared_cache_path=os.getenv(
+            "SHARED_CACHE_PATH", "app/cache/market_cache.sqlite3"
+        ),
+        shared_cache_lock_ttl=float(os.getenv("SHARED_CACHE_LOCK_TTL", "30")),
+        shared_cache_stale_ttl=float(os.getenv("SHARED_CACHE_STALE_TTL", "5")),
+        forex_provider_mode=os.getenv("FOREX_PROVIDER_MODE", "live").lower(),
+        twelve_data_api_key=os.getenv("TWELVE_DATA_API_KEY"),
+        twelve_data_base_url=os.getenv(
+            "TWELVE_DATA_BASE_URL", "https://api.twelvedata.com"
+        ).rstrip("/"),
+        forex_record_dir=os.getenv("FOREX_RECORD_DIR", "app/recordings"),
+        replay_latency_ms=float(os.getenv("REPLAY_LATENCY_MS", "0")),
+        replay_error_rate=float(os.getenv("REPLAY_ERROR_RATE", "0")),
+        replay_seed=int(os.getenv("REPLAY_SEED", "0")),
+        state_enabled=_env_bool("STATE_ENABLED", "1"),
+        state_snapshot_path=os.getenv(
+            "STATE_SNAPSHOT_PATH", "app/state/snapshot.bin"
+        ),
+        state_snapshot_interval=float(os.getenv("STATE_SNAPSHOT_INTERVAL", "60")),
+        tick_feed=os.getenv("TICK_FEED", "").strip().lower(),
+        tick_symbols=[
+            s.strip() for s in os.getenv("TICK_SYMBOLS", "EUR/USD").split(",") if s.strip()
+        ],
+        tick_replay_dir=os.getenv("TICK_REPLAY_DIR", "app/recordings/ticks"),
+        tick_exchange=os.getenv("TICK_EXCHANGE", "oanda"),
+    )
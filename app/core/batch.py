@@ -0,0 +1,293 @@
+import os
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from app.core.decision import (
+    DEFAULT_INDEX_SYMBOL,
+    DEFAULT_PARAMS,
+    DEFAULT_TIMEFRAMES,
+    evaluate_signal,
+    strength_timeframe,
+)
+from app.core.market_data import MarketDataService
+from app.core.ring_buffer import get_candle_store
+from app.strategy.currency_strength import MAJOR_CROSSES, split_pair
+
+
+SeriesKey = Tuple[str, str]     # (symbol, timeframe)
+
+# Fewer bars than this at `as_of` and structure detection has too little
+# history to be comparable with a live evaluation; the job errors instead.
+MIN_JOB_BARS = 50
+
+
+def parse_as_of(as_of: Optional[str]) -> Optional[pd.Timestamp]:
+    """
+    ISO timestamp → naive UTC (the candle index convention).
+    "2024-01-01T12:00:00Z" and "+02:00" offsets are converted.
+    """
+    if not as_of:
+        return None
+
+    ts = pd.Timestamp(as_of)
+
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+
+    return ts
+
+
+# =========
+# Data Models
+# =========
+
+@dataclass
+class BatchJob:
+    symbol: str
+    index_symbol: str = DEFAULT_INDEX_SYMBOL
+    timeframes: List[str] = field(default_factory=lambda: list(DEFAULT_TIMEFRAMES))
+    params: Dict = field(default_factory=dict)
+    as_of: Optional[str] = None     # ISO timestamp; None → latest bar
+    job_id: Optional[str] = None
+
+    def series(self) -> List[SeriesKey]:
+        """
+        Every series evaluate_signal may read for this job.
+        """
+        if "USD" in split_pair(self.symbol):
+            return [
+                (symbol, tf)
+                for symbol in (self.symbol, self.index_symbol)
+                for tf in self.timeframes
+            ]
+
+        # Crosses are confirmed by the currency-strength matrix
+        strength_tf = strength_timeframe(self.params, self.timeframes)
+
+        return [(self.symbol, tf) for tf in self.timeframes] + [
+            (pair, strength_tf) for pair in MAJOR_CROSSES
+        ]
+
+
+class FrameMarketData(MarketDataService):
+    """
+    MarketDataService over preloaded frames, cut at `as_of`.
+    Never touches the provider — safe to use inside pool workers.
+    """
+
+    def __init__(
+        self,
+        frames: Dict[SeriesKey, pd.DataFrame],
+        as_of: Optional[str] = None,
+    ):
+        self.frames = frames
+        self.as_of = parse_as_of(as_of)
+
+    def fetch_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int = 300,
+    ) -> pd.DataFrame:
+        df = self.frames[(symbol, timeframe)]
+
+        if self.as_of is not None:
+            df = df.loc[:self.as_of]
+
+        return df.iloc[-limit:]
+
+    @contextmanager
+    def read_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int = 300,
+    ) -> Iterator[pd.DataFrame]:
+        yield self.fetch_ohlcv(symbol, timeframe, limit)
+
+    def coverage_error(self, series: List[SeriesKey], min_bars: int) -> Optional[str]:
+        """
+        Why the preloaded frames cannot answer a job at `as_of`, or None.
+        """
+        for symbol, tf in series:
+            df = self.frames[(symbol, tf)]
+
+            if df.empty:
+                return f"No candles for {symbol} {tf}"
+
+            if self.as_of is not None and self.as_of < df.index[0]:
+                return (
+                    f"as_of {self.as_of} predates loaded {symbol} {tf} history "
+                    f"(starts {df.index[0]}); raise `history`"
+                )
+
+            bars = len(self.fetch_ohlcv(symbol, tf, len(df)))
+            if bars < min_bars:
+                return (
+                    f"Only {bars} {symbol} {tf} bars at as_of "
+                    f"(need {min_bars}); raise `history`"
+                )
+
+        return None
+
+    def fetch_entry_frame(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int = 300,
+    ) -> pd.DataFrame:
+        # Historical jobs never see live tick feeds
+        return self.fetch_ohlcv(symbol, timeframe, limit)
+
+
+# =========
+# Worker side
+# =========
+
+_worker_frames: Dict[SeriesKey, pd.DataFrame] = {}
+
+
+def _init_worker(frames: Dict[SeriesKey, pd.DataFrame]):
+    """
+    Candles are shipped once per worker, not once per job.
+    """
+    global _worker_frames
+    _worker_frames = frames
+
+
+def _result(job: BatchJob, **fields) -> Dict:
+    return {
+        "job_id": job.job_id,
+        "symbol": job.symbol,
+        "as_of": job.as_of,
+        **fields,
+    }
+
+
+def _run_job(job: BatchJob) -> Dict:
+    result = _result(job)
+
+    try:
+        market_data = FrameMarketData(_worker_frames, as_of=job.as_of)
+        swing_lookback = job.params.get("swing_lookback", DEFAULT_PARAMS["swing_lookback"])
+
+        error = market_data.coverage_error(
+            job.series(),
+            min_bars=max(MIN_JOB_BARS, 2 * swing_lookback + 2),
+        )
+        if error:
+            result["error"] = error
+            return result
+
+        result["decision"] = evaluate_signal(
+            market_data,
+            symbol=job.symbol,
+            index_symbol=job.index_symbol,
+            timeframes=job.timeframes,
+            params=job.params,
+        )
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    return result
+
+
+# =========
+# Driver
+# =========
+
+def prefetch_frames(
+    jobs: List[BatchJob],
+    market_data: Optional[MarketDataService] = None,
+    history: int = 300,
+) -> Tuple[Dict[SeriesKey, pd.DataFrame], Dict[SeriesKey, str]]:
+    """
+    Fetch every distinct (symbol, timeframe) the jobs need exactly once,
+    `history` bars each. Beyond what the live ring buffers hold, the
+    candles come straight from the provider.
+    Returns (frames, errors).
+    """
+
+    market_data = market_data or MarketDataService()
+    fetch = (
+        market_data.fetch_ohlcv
+        if history <= get_candle_store().capacity
+        else market_data.fetch_history
+    )
+    frames: Dict[SeriesKey, pd.DataFrame] = {}
+    errors: Dict[SeriesKey, str] = {}
+
+    for key in dict.fromkeys(k for job in jobs for k in job.series()):
+        symbol, tf = key
+        try:
+            frames[key] = fetch(symbol, tf, history)
+        except Exception as e:
+            errors[key] = f"{type(e).__name__}: {e}"
+
+    return frames, errors
+
+
+def run_batch(
+    jobs: Iterable[BatchJob],
+    max_workers: Optional[int] = None,
+    market_data: Optional[MarketDataService] = None,
+    history: int = 300,
+) -> Iterator[Dict]:
+    """
+    Evaluate many jobs on a process pool, yielding results AS THEY FINISH
+    (not in submission order). Each result carries the job's job_id.
+    """
+
+    planned: List[Tuple[BatchJob, List[SeriesKey]]] = []
+
+    for job in jobs:
+        # A malformed job (e.g. bad params) fails alone, as an error row
+        try:
+            planned.append((job, job.series()))
+        except Exception as e:
+            yield _result(job, error=f"{type(e).__name__}: {e}")
+
+    frames, errors = prefetch_frames([job for job, _ in planned], market_data, history)
+
+    runnable: List[BatchJob] = []
+
+    for job, series in planned:
+        missing = [k for k in series if k in errors]
+
+        if missing:
+            symbol, tf = missing[0]
+            yield _result(
+                job,
+                error=f"Candles unavailable for {symbol} {tf}: {errors[missing[0]]}",
+            )
+        else:
+            runnable.append(job)
+
+    workers = max_workers or os.cpu_count() or 1
+
+    if workers == 1 or len(runnable) <= 1:
+        _init_worker(frames)
+        for job in runnable:
+            yield _run_job(job)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(frames,),
+    ) as pool:
+        futures = [pool.submit(_run_job, job) for job in runnable]
+
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def job_from_dict(data: Dict) -> BatchJob:
+    """
+    Build a job from request JSON; missing / null fields take defaults.
+    """
+    return BatchJob(**{k: v for k, v in data.items() if v is not None})
@@ -0,0 +1,419 @@
+import asyncio
+import hashlib
+import json
+from typing import Dict, List, Optional
+
+from app.core.market_data import MarketDataService, series_is_current
+from app.core.ring_buffer import get_candle_store
+from app.core.shared_cache import get_shared_cache
+from app.core.singleflight import AsyncSingleFlight, SingleFlight
+from app.core.state import get_decision_history
+from app.core.tick_aggregator import get_tick_aggregator
+from app.core.timeframes import TIMEFRAME_SECONDS, current_bar
+from app.strategy.alignment import evaluate_alignment
+from app.strategy.index_filter import index_confirms_pair
+from app.strategy.candles import validate_entry_candle
+from app.strategy.currency_strength import (
+    MAJOR_CROSSES,
+    split_pair,
+    strength_confirms_pair,
+    strength_from_closes,
+)
+from app.strategy.zone_index import ZONE_INVALIDATED, ZoneIndex, get_zone_index
+
+
+DEFAULT_SYMBOL = "EUR/USD"
+DEFAULT_INDEX_SYMBOL = "DXY"   # handled by exchange adapter
+DEFAULT_TIMEFRAMES = ["1h", "30m", "15m"]
+
+# Strategy parameters a caller may override per evaluation
+DEFAULT_PARAMS = {
+    "swing_lookback": 3,
+    "min_aligned": 2,
+    # Non-USD pairs (crosses) are confirmed by currency strength instead
+    # of the USD index; None → slowest timeframe of the evaluation
+    "strength_timeframe": None,
+    "strength_lookback": 20,
+}
+
+_NS = 1_000_000_000
+
+_decision_flight = SingleFlight()
+_async_decision_flight = AsyncSingleFlight()
+
+
+def strength_timeframe(params: Dict, timeframes: List[str]) -> str:
+    """
+    Timeframe of the currency-strength matrix: params["strength_timeframe"],
+    else the slowest of `timeframes`.
+    """
+    return params.get("strength_timeframe") or max(
+        timeframes, key=TIMEFRAME_SECONDS.__getitem__
+    )
+
+
+# =========
+# Phase 2C decision
+# =========
+
+def evaluate_signal(
+    market_data: MarketDataService,
+    symbol: str = DEFAULT_SYMBOL,
+    index_symbol: str = DEFAULT_INDEX_SYMBOL,
+    timeframes: Optional[List[str]] = None,
+    params: Optional[Dict] = None,
+    zone_index: Optional[ZoneIndex] = None,
+) -> Dict:
+    """
+    Run the full pair → index → zone → entry pipeline for one symbol.
+    Decision only — no execution.
+
+    Zones are tracked in `zone_index` across calls (live process index
+    for the API); without one, a throwaway index is used so historical
+    evaluations never touch live zone state.
+    """
+
+    timeframes = timeframes or DEFAULT_TIMEFRAMES
+    params = {**DEFAULT_PARAMS, **(params or {})}
+
+    # =========================
+    # 1️⃣ Pair structure
+    # =========================
+    pair_structures = market_data.evaluate_structure_multi_tf(
+        symbol=symbol,
+        timeframes=timeframes,
+        failure_validator=lambda idx: True,  # already validated in Phase 2A
+        swing_lookback=params["swing_lookback"],
+    )
+
+    pair_alignment = evaluate_alignment(
+        pair_structures,
+        min_aligned=params["min_aligned"],
+    )
+
+    if not pair_alignment["aligned"]:
+        return {
+            "trade_allowed": False,
+            "reason": "Pair structure not aligned",
+            "details": pair_alignment,
+        }
+
+    # =========================
+    # 2️⃣ Index confirmation
+    # =========================
+    if "USD" in split_pair(symbol):
+        index_check = _index_check(market_data, symbol, index_symbol,
+                                   timeframes, params, pair_alignment)
+    else:
+        index_check = _strength_check(market_data, symbol, timeframes,
+                                      params, pair_alignment)
+
+    if not index_check["allowed"]:
+        return {
+            "trade_allowed": False,
+            "reason": index_check["reason"],
+        }
+
+    # =========================
+    # 3️⃣ Register zones from aligned TFs
+    # =========================
+    direction = pair_alignment["direction"]
+    aligned_tfs = pair_alignment["valid_timeframes"]
+
+    if zone_index is None:
+        zone_index = ZoneIndex()
+
+    # Entry frames: live forming bar when a tick feed runs for the symbol
+    frames = {tf: market_data.fetch_entry_frame(symbol, tf) for tf in aligned_tfs}
+
+    current_zones = [
+        zone_index.add(symbol, pair_structures[tf].zone, frames[tf].index[-1].value)
+        for tf in aligned_tfs
+        if pair_structures[tf].zone
+    ]
+
+    # Gate on THIS evaluation's structure; zones remembered from earlier
+    # evaluations only widen the entry check below
+    if not any(
+        r.direction == direction and r.state != ZONE_INVALIDATED
+        for r in current_zones
+    ):
+        return {
+            "trade_allowed": False,
+            "reason": "No valid structure zone",
+        }
+
+    # =========================
+    # 4️⃣ Entry check against EVERY active zone the latest candle penetrates
+    # =========================
+    zone = None
+    zone_tf = None
+
+    for tf in aligned_tfs:
+        df = frames[tf]
+        current_idx = len(df) - 1
+        candle = df.iloc[current_idx]
+
+        # Only closed bars invalidate zones: a still-forming last bar
+        # just retests, and the bar before it is the latest close
+        forming = df.index[current_idx].value >= current_bar(tf) * _NS
+
+        if forming and current_idx > 0:
+            previous = df.iloc[current_idx - 1]
+            zone_index.on_bar(
+                symbol,
+                high=previous.high,
+                low=previous.low,
+                close=previous.close,
+                timestamp=df.index[current_idx - 1].value,
+                timeframe=tf,
+            )
+
+        zone_index.on_bar(
+            symbol,
+            high=candle.high,
+            low=candle.low,
+            close=candle.close,
+            timestamp=df.index[current_idx].value,
+            timeframe=tf,
+            closed=not forming,
+        )
+
+        for record in zone_index.penetrated(
+            symbol,
+            low=candle.low,
+            high=candle.high,
+            timeframe=tf,
+            direction=direction,
+        ):
+            if validate_entry_candle(
+                df=df,
+                idx=current_idx,
+                direction=direction,
+                zone=(record.lower, record.upper),
+            ):
+                zone = record.zone
+                zone_tf = tf
+                break
+
+        if zone:
+            break
+
+    if not zone:
+        return {
+            "trade_allowed": False,
+            "reason": "No valid entry candle",
+        }
+
+    # =========================
+    # ✅ FINAL DECISION
+    # =========================
+    return {
+        "trade_allowed": True,
+        "direction": direction,
+        "zone": {
+            "lower": zone.lower,
+            "upper": zone.upper,
+            "timeframe": zone_tf,
+        },
+        "entry_index": current_idx,
+        "note": "Phase 2C decision only — no execution",
+    }
+
+
+def _index_check(
+    market_data: MarketDataService,
+    symbol: str,
+    index_symbol: str,
+    timeframes: List[str],
+    params: Dict,
+    pair_alignment: Dict,
+) -> Dict:
+    index_structures = market_data.evaluate_structure_multi_tf(
+        symbol=index_symbol,
+        timeframes=timeframes,
+        failure_validator=lambda idx: True,
+        swing_lookback=params["swing_lookback"],
+    )
+
+    index_alignment = evaluate_alignment(
+        index_structures,
+        min_aligned=params["min_aligned"],
+    )
+
+    return index_confirms_pair(
+        symbol=symbol,
+        pair_alignment=pair_alignment,
+        index_alignment=index_alignment,
+    )
+
+
+def _strength_check(
+    market_data: MarketDataService,
+    symbol: str,
+    timeframes: List[str],
+    params: Dict,
+    pair_alignment: Dict,
+) -> Dict:
+    strength_tf = strength_timeframe(params, timeframes)
+
+    closes = market_data.fetch_close_matrix(MAJOR_CROSSES, strength_tf)
+    strength = strength_from_closes(closes)
+
+    return strength_confirms_pair(
+        symbol=symbol,
+        pair_alignment=pair_alignment,
+        strength=strength,
+        lookback=params["strength_lookback"],
+    )
+
+
+# =========
+# Coalesced entry points
+# =========
+
+def _decision_key(symbol: str, index_symbol: str, timeframes: List[str]):
+    return (symbol, index_symbol, tuple(timeframes))
+
+
+def _history_key(symbol: str, index_symbol: str, timeframes: List[str]) -> str:
+    return "|".join([symbol, index_symbol, *timeframes])
+
+
+def _fastest_bar(timeframes: List[str]) -> int:
+    return current_bar(min(timeframes, key=TIMEFRAME_SECONDS.__getitem__))
+
+
+def _entry(
+    decision: Dict,
+    symbol: str,
+    index_symbol: str,
+    timeframes: List[str],
+) -> Dict:
+    """
+    A decision with its HTTP validators, fixed at evaluation time so
+    every worker serving it answers with the same ones: the ETag hashes
+    the decision itself, last_modified is the newest evaluated bar
+    (epoch seconds, None when no series is stored).
+    """
+    store = get_candle_store()
+    bars = [
+        buffer.last_timestamp()
+        for series_symbol in (symbol, index_symbol)
+        for tf in timeframes
+        if (buffer := store.get(series_symbol, tf)) is not None and len(buffer)
+    ]
+    canonical = json.dumps(decision, sort_keys=True, default=str).encode()
+
+    return {
+        "decision": decision,
+        "etag": hashlib.sha1(canonical).hexdigest()[:20],
+        "last_modified": max(bars) // _NS if bars else None,
+    }
+
+
+def get_decision_entry(
+    symbol: str = DEFAULT_SYMBOL,
+    index_symbol: str = DEFAULT_INDEX_SYMBOL,
+    timeframes: Optional[List[str]] = None,
+) -> Dict:
+    """
+    Concurrent callers asking for the same decision share one evaluation.
+    Returns {"decision", "etag", "last_modified"} (see _entry).
+
+    With the shared cache enabled, the entry is also reused by every
+    worker process until the fastest timeframe opens a new bar (only
+    briefly if the provider had not yet published the last closed bar,
+    or if a live tick feed is forming the symbol's bars).
+    """
+
+    timeframes = timeframes or DEFAULT_TIMEFRAMES
+    key = _decision_key(symbol, index_symbol, timeframes)
+    history_key = _history_key(symbol, index_symbol, timeframes)
+
+    def evaluate() -> Dict:
+        decision = evaluate_signal(
+            MarketDataService(),
+            symbol=symbol,
+            index_symbol=index_symbol,
+            timeframes=timeframes,
+            zone_index=get_zone_index(),
+        )
+        get_decision_history().append(history_key, decision)
+        return _entry(decision, symbol, index_symbol, timeframes)
+
+    def evaluate_shared() -> Dict:
+        cache = get_shared_cache()
+
+        if cache is None:
+            return evaluate()
+
+        return cache.get_or_refresh_decision(
+            key=history_key,
+            bar=_fastest_bar(timeframes),
+            evaluate=evaluate,
+            # Built from candles missing the bar that just closed, or from
+            # a forming bar that keeps changing intrabar → short TTL
+            is_complete=lambda entry: get_tick_aggregator(symbol) is None and all(
+                series_is_current(symbol, tf) for tf in timeframes
+            ),
+        )
+
+    return _decision_flight.do(key, evaluate_shared)
+
+
+def peek_decision_entry(
+    symbol: str = DEFAULT_SYMBOL,
+    index_symbol: str = DEFAULT_INDEX_SYMBOL,
+    timeframes: Optional[List[str]] = None,
+) -> Optional[Dict]:
+    """
+    The entry get_decision_entry would reuse right now, without
+    evaluating; None when it would evaluate (or the shared cache is off).
+    Lets conditional requests be answered before any evaluation.
+    """
+
+    cache = get_shared_cache()
+
+    if cache is None:
+        return None
+
+    timeframes = timeframes or DEFAULT_TIMEFRAMES
+
+    return cache.get_decision(
+        _history_key(symbol, index_symbol, timeframes),
+        _fastest_bar(timeframes),
+    )
+
+
+def get_decision(
+    symbol: str = DEFAULT_SYMBOL,
+    index_symbol: str = DEFAULT_INDEX_SYMBOL,
+    timeframes: Optional[List[str]] = None,
+) -> Dict:
+    """
+    The decision of get_decision_entry (coalesced, shared across workers).
+    """
+
+    return get_decision_entry(symbol, index_symbol, timeframes)["decision"]
+
+
+async def get_decision_async(
+    symbol: str = DEFAULT_SYMBOL,
+    index_symbol: str = DEFAULT_INDEX_SYMBOL,
+    timeframes: Optional[List[str]] = None,
+) -> Dict:
+    """
+    Async variant of get_decision; runs the evaluation off the event loop.
+    """
+
+    timeframes = timeframes or DEFAULT_TIMEFRAMES
+
+    return await _async_decision_flight.do(
+        _decision_key(symbol, index_symbol, timeframes),
+        asyncio.to_thread,
+        get_decision,
+        symbol,
+        index_symbol,
+        timeframes,
+    )
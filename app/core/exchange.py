@@ -1,11 +1,10 @@
-import ccxt
-
-
 def get_exchange():
     """
     Factory for CCXT exchange.
     Phase 2: data access only (paper / observation).
     """
+    import ccxt     # heavy; only loaded when an exchange is actually used
+
     exchange = ccxt.binance({
         "enableRateLimit": True,
     })
@@ -1,64 +1,110 @@
-import os
 import requests
 import pandas as pd
 from datetime import datetime
-from dotenv import load_dotenv
+from typing import Dict, Optional
 
-load_dotenv()
+from app.config import get_settings
 
-API_KEY = os.getenv("TWELVE_DATA_API_KEY")
 BASE_URL = "https://api.twelvedata.com/time_series"
 
 
+def payload_to_frame(instrument: str, payload: Dict) -> pd.DataFrame:
+    """
+    Convert a Twelve Data time_series payload into an OHLCV DataFrame.
+    """
+
+    if "values" not in payload:
+        raise ValueError(f"No data returned for {instrument}: {payload}")
+
+    rows = []
+    for c in payload["values"]:
+        rows.append({
+            "timestamp": pd.to_datetime(c["datetime"]),
+            "open": float(c["open"]),
+            "high": float(c["high"]),
+            "low": float(c["low"]),
+            "close": float(c["close"]),
+            "volume": float(c.get("volume", 0)),
+        })
+
+    df = pd.DataFrame(rows)
+    df.sort_values("timestamp", inplace=True)
+    df.set_index("timestamp", inplace=True)
+
+    return df
+
+
 class ForexDataProvider:
     """
     Data-only Forex & Index provider using Twelve Data.
     No execution. No trading logic.
     """
 
-    def fetch_ohlcv(
+    def __init__(self, base_url: str = BASE_URL, api_key: Optional[str] = None):
+        self.base_url = base_url
+        # Read on first construction, not at import (.env loaded lazily)
+        self.api_key = api_key or get_settings().twelve_data_api_key
+
+    def fetch_payload(
         self,
         instrument: str,
         granularity: str,
         count: int = 300,
-    ) -> pd.DataFrame:
+    ) -> Dict:
         """
-        Fetch OHLCV candles from Twelve Data and return DataFrame.
+        Fetch the raw time_series JSON payload from Twelve Data.
         """
 
         params = {
             "symbol": instrument,
             "interval": granularity,
             "outputsize": count,
-            "apikey": API_KEY,
+            "apikey": self.api_key,
             "format": "JSON",
         }
 
-        response = requests.get(BASE_URL, params=params)
+        response = requests.get(self.base_url, params=params)
         response.raise_for_status()
 
-        payload = response.json()
+        return response.json()
 
-        if "values" not in payload:
-            raise ValueError(f"No data returned for {instrument}: {payload}")
-
-        rows = []
-        for c in payload["values"]:
-            rows.append({
-                "timestamp": pd.to_datetime(c["datetime"]),
-                "open": float(c["open"]),
-                "high": float(c["high"]),
-                "low": float(c["low"]),
-                "close": float(c["close"]),
-                "volume": float(c.get("volume", 0)),
-            })
+    def fetch_ohlcv(
+        self,
+        instrument: str,
+        granularity: str,
+        count: int = 300,
+    ) -> pd.DataFrame:
+        """
+        Fetch OHLCV candles from Twelve Data and return DataFrame.
+        """
 
-        df = pd.DataFrame(rows)
-        df.sort_values("timestamp", inplace=True)
-        df.set_index("timestamp", inplace=True)
+        payload = self.fetch_payload(instrument, granularity, count)
 
-        return df
+        return payload_to_frame(instrument, payload)
 
 
 def get_forex_provider() -> ForexDataProvider:
-    return ForexDataProvider()
+    """
+    Provider selected by FOREX_PROVIDER_MODE:
+    - "live"   → Twelve Data (or TWELVE_DATA_BASE_URL, e.g. the replay stub)
+    - "record" → live, and every payload is saved to FOREX_RECORD_DIR
+    - "replay" → serve recorded payloads from FOREX_RECORD_DIR, no network
+    """
+    settings = get_settings()
+    base_url = f"{settings.twelve_data_base_url}/time_series"
+
+    if settings.forex_provider_mode == "record":
+        from app.core.replay_provider import RecordingForexDataProvider
+
+        return RecordingForexDataProvider(
+            directory=settings.forex_record_dir,
+            base_url=base_url,
+        )
+
+    if settings.forex_provider_mode == "replay":
+        from app.core.replay_provider import ReplayForexDataProvider
+
+        # Default store is process-wide (seeded RNG, loaded payloads)
+        return ReplayForexDataProvider()
+
+    return ForexDataProvider(base_url=base_url)
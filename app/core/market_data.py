@@ -1,10 +1,63 @@
+import asyncio
+import time
+from contextlib import contextmanager
 import pandas as pd
-from typing import Dict, List, Callable
+from typing import Dict, Iterator, List, Callable, Optional, Tuple
 from app.core.forex_provider import get_forex_provider
-from app.core.timeframes import TIMEFRAME_MAP
+from app.core.ring_buffer import CandleRingBuffer, get_candle_store
+from app.core.shared_cache import SharedCache, get_shared_cache
+from app.core.singleflight import AsyncSingleFlight, SingleFlight
+from app.core.tick_aggregator import get_tick_aggregator
+from app.core.timeframes import (
+    TIMEFRAME_MAP,
+    TIMEFRAME_SECONDS,
+    current_bar,
+    last_closed_bar,
+)
 from app.strategy.structure import evaluate_structure, StructureResult
 
 
+# Shared by every MarketDataService in the process, so concurrent
+# requests for the same candles trigger ONE provider call.
+_fetch_flight = SingleFlight()
+_async_fetch_flight = AsyncSingleFlight()
+
+# Extra bars requested on a delta refresh, so the newest stored bar
+# (possibly still forming when it was stored) is always re-fetched.
+DELTA_OVERLAP_BARS = 2
+
+_NS = 1_000_000_000
+
+# (symbol, timeframe) → bar whose complete shared-cache refresh this
+# process already ingested; later calls in that bar skip the cache read
+_ingested_bars: Dict[Tuple[str, str], int] = {}
+
+
+def has_last_closed_bar(
+    df: pd.DataFrame,
+    timeframe: str,
+    now: Optional[float] = None,
+) -> bool:
+    """
+    True when `df` reaches the bar that most recently closed on the
+    clock, i.e. the provider already published it. Frames fetched just
+    after a close (before publication) are stale for the new bar.
+    """
+    if df.empty:
+        return False
+    return df.index[-1].value >= last_closed_bar(timeframe, now) * _NS
+
+
+def series_is_current(symbol: str, timeframe: str, now: Optional[float] = None) -> bool:
+    """
+    has_last_closed_bar for the series held in the process candle store.
+    """
+    buffer = get_candle_store().get(symbol, timeframe)
+    if buffer is None or len(buffer) == 0:
+        return False
+    return buffer.last_timestamp() >= last_closed_bar(timeframe, now) * _NS
+
+
 class MarketDataService:
     """
     Responsible ONLY for:
@@ -27,8 +80,183 @@ class MarketDataService:
         """
         Fetch OHLCV data from Forex provider
         and return a clean pandas DataFrame.
+
+        Concurrent identical fetches are coalesced into one provider call,
+        and the result is shared with other worker processes for the
+        rest of the current bar. Candles land in the process ring-buffer
+        store; the returned frame is a copy, unaffected by later updates.
+        """
+
+        return self._refresh(symbol, timeframe, limit).frame(limit)
+
+    @contextmanager
+    def read_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int = 300,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Zero-copy variant of fetch_ohlcv for read-only work done inside
+        the block (see CandleRingBuffer.reading): no frame copy, but
+        writes to the series wait until the block exits.
+        """
+
+        buffer = self._refresh(symbol, timeframe, limit)
+
+        with buffer.reading(limit) as df:
+            yield df
+
+    def _refresh(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+    ) -> CandleRingBuffer:
+        return _fetch_flight.do(
+            (symbol, timeframe, limit),
+            self._fetch_into_store,
+            symbol,
+            timeframe,
+            limit,
+        )
+
+    async def fetch_ohlcv_async(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int = 300,
+    ) -> pd.DataFrame:
+        """
+        Async variant of fetch_ohlcv.
+
+        Coroutines on the same loop share one worker thread; that thread
+        still goes through the sync flight, so async and sync callers
+        are coalesced together.
+        """
+
+        return await _async_fetch_flight.do(
+            (symbol, timeframe, limit),
+            asyncio.to_thread,
+            self.fetch_ohlcv,
+            symbol,
+            timeframe,
+            limit,
+        )
+
+    def fetch_history(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+    ) -> pd.DataFrame:
+        """
+        Up to `limit` bars straight from the provider, for research jobs
+        reaching further back than the live ring buffers hold. Coalesced,
+        but neither cached nor stored.
+        """
+
+        return _fetch_flight.do(
+            ("history", symbol, timeframe, limit),
+            self._fetch_from_provider,
+            symbol,
+            timeframe,
+            limit,
+        )
+
+    def _fetch_into_store(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+    ) -> CandleRingBuffer:
+        store = get_candle_store()
+        cache = get_shared_cache()
+
+        if cache is not None:
+            bar = current_bar(timeframe)
+            buffer = store.get(symbol, timeframe)
+
+            if buffer is not None and _ingested_bars.get((symbol, timeframe)) == bar:
+                # Entries are per bar: nothing new to read before the next one
+                return buffer
+
+            # One refresh per (symbol, timeframe) and bar for the whole
+            # host; the entry holds the full series so cold workers can
+            # use it, ingest keeps only the bars this worker is missing
+            df = self._fetch_shared(cache, symbol, timeframe, store.capacity)
+
+            if has_last_closed_bar(df, timeframe):
+                _ingested_bars[(symbol, timeframe)] = bar
+
+        else:
+            df = self._fetch_delta(symbol, timeframe, limit)
+
+        return store.ingest(symbol, timeframe, df)
+
+    def _fetch_delta(self, symbol: str, timeframe: str, limit: int) -> pd.DataFrame:
+        """
+        Provider bars that bring the stored series up to date: only the
+        bars since the newest stored one when the buffer is warm (e.g.
+        restored from a snapshot), otherwise `limit`.
+        """
+        buffer = get_candle_store().get(symbol, timeframe)
+        count = self._delta_count(buffer, timeframe, limit)
+
+        df = self._fetch_from_provider(symbol, timeframe, count)
+
+        if count < limit and df.index[0].value > buffer.last_timestamp():
+            # Delta does not reach back to what we hold — gap, refetch all
+            df = self._fetch_from_provider(symbol, timeframe, limit)
+
+        return df
+
+    def _fetch_full(self, symbol: str, timeframe: str, limit: int) -> pd.DataFrame:
         """
+        `limit` bars for the shared cache (other workers may be cold).
+        A warm worker fetches only the delta and publishes its buffer.
+        """
+        df = self._fetch_delta(symbol, timeframe, limit)
+
+        if len(df) >= limit:
+            return df
+
+        return get_candle_store().ingest(symbol, timeframe, df).frame(limit)
+
+    def _delta_count(self, buffer, timeframe: str, limit: int) -> int:
+        """
+        How many bars to request: everything if the series is cold,
+        otherwise only the bars since the newest stored one (e.g. after
+        a state snapshot restore).
+        """
+        if buffer is None or len(buffer) < limit:
+            return limit
+
+        elapsed = time.time() - buffer.last_timestamp() / 1e9
+        missing = int(elapsed // TIMEFRAME_SECONDS[timeframe])
+
+        return max(1, min(limit, missing + DELTA_OVERLAP_BARS))
+
+    def _fetch_shared(
+        self,
+        cache: SharedCache,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+    ) -> pd.DataFrame:
+        return cache.get_or_refresh_candles(
+            key=f"{symbol}|{timeframe}",
+            bar=current_bar(timeframe),
+            fetch=lambda: self._fetch_full(symbol, timeframe, limit),
+            is_complete=lambda df: has_last_closed_bar(df, timeframe),
+        )
 
+    def _fetch_from_provider(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+    ) -> pd.DataFrame:
         granularity = TIMEFRAME_MAP[timeframe]
 
         df = self.provider.fetch_ohlcv(
@@ -39,11 +267,53 @@ class MarketDataService:
 
         return df
 
+    def fetch_entry_frame(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int = 300,
+    ) -> pd.DataFrame:
+        """
+        Candles for the entry-candle check. When a registered
+        TickAggregator builds this series, its forming bar is the last
+        row (intrabar entries); otherwise the provider candles.
+        """
+
+        aggregator = get_tick_aggregator(symbol)
+
+        if (
+            aggregator is None
+            or timeframe not in aggregator.timeframes
+            or aggregator.forming_bar(timeframe) is None
+        ):
+            return self.fetch_ohlcv(symbol, timeframe, limit)
+
+        return aggregator.frame(timeframe, limit=limit)
+
+    def fetch_close_matrix(
+        self,
+        symbols: List[str],
+        timeframe: str,
+        limit: int = 300,
+    ) -> pd.DataFrame:
+        """
+        Close prices of many symbols on one timeframe, one column per
+        symbol, inner-joined on timestamp (only bars every symbol has).
+        """
+
+        closes = {
+            symbol: self.fetch_ohlcv(symbol, timeframe, limit)["close"]
+            for symbol in symbols
+        }
+
+        return pd.concat(closes, axis=1, join="inner")
+
     def evaluate_structure_multi_tf(
         self,
         symbol: str,
         timeframes: List[str],
         failure_validator: Callable,
+        swing_lookback: int = 3,
     ) -> Dict[str, StructureResult]:
         """
         Evaluate structure independently on EACH timeframe.
@@ -59,13 +329,14 @@ class MarketDataService:
         results: Dict[str, StructureResult] = {}
 
         for tf in timeframes:
-            df = self.fetch_ohlcv(symbol=symbol, timeframe=tf)
-
-            result = evaluate_structure(
-                df=df,
-                timeframe=tf,
-                failure_validator=failure_validator,
-            )
+            # Structure detection only reads: run it on the buffer itself
+            with self.read_ohlcv(symbol=symbol, timeframe=tf) as df:
+                result = evaluate_structure(
+                    df=df,
+                    timeframe=tf,
+                    failure_validator=failure_validator,
+                    swing_lookback=swing_lookback,
+                )
 
             results[tf] = result
 
@@ -0,0 +1,209 @@
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import requests
+
+from app.config import get_settings
+from app.core.forex_provider import ForexDataProvider
+
+
+# =========
+# Recording layout
+# =========
+
+def recording_path(directory: str, instrument: str, granularity: str) -> Path:
+    """
+    One JSON file per (instrument, granularity), e.g. EURUSD_15min.json
+    """
+    slug = instrument.replace("/", "").replace(" ", "_")
+    return Path(directory) / f"{slug}_{granularity}.json"
+
+
+# Twelve Data's largest outputsize; merged recordings are capped to it
+MAX_RECORDED_VALUES = 5000
+
+
+def merge_values(recorded: List[Dict], fetched: List[Dict]) -> List[Dict]:
+    """
+    Union of two Twelve Data value lists (newest first), keyed by
+    datetime; fetched values win (a bar recorded while still forming
+    is replaced by its final version).
+    """
+    merged = {v["datetime"]: v for v in recorded}
+    merged.update((v["datetime"], v) for v in fetched)
+
+    values = sorted(merged.values(), key=lambda v: v["datetime"], reverse=True)
+    return values[:MAX_RECORDED_VALUES]
+
+
+class InjectedReplayError(requests.HTTPError):
+    """
+    Raised by the replay layer to simulate a provider failure.
+    """
+
+
+# =========
+# Recording
+# =========
+
+class RecordingForexDataProvider(ForexDataProvider):
+    """
+    Live provider that also records every raw payload to disk,
+    so the session can be replayed later without network or API key.
+
+    Payloads are merged into the existing recording rather than
+    replacing it, so a short delta fetch never shrinks a long one.
+    """
+
+    _write_lock = threading.Lock()
+
+    def __init__(self, directory: str, **kwargs):
+        super().__init__(**kwargs)
+        self.directory = directory
+        Path(directory).mkdir(parents=True, exist_ok=True)
+
+    def fetch_payload(
+        self,
+        instrument: str,
+        granularity: str,
+        count: int = 300,
+    ) -> Dict:
+        payload = super().fetch_payload(instrument, granularity, count)
+
+        if "values" in payload:
+            self._record(recording_path(self.directory, instrument, granularity), payload)
+
+        return payload
+
+    def _record(self, path: Path, payload: Dict):
+        # Unique per writer: threads and worker processes may record
+        # the same series at once
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+        with self._write_lock:
+            try:
+                recorded = json.loads(path.read_text()).get("values", [])
+            except (OSError, ValueError):
+                recorded = []
+
+            merged = {**payload, "values": merge_values(recorded, payload["values"])}
+
+            tmp.write_text(json.dumps(merged))
+            tmp.replace(path)
+
+
+# =========
+# Replay
+# =========
+
+class ReplayStore:
+    """
+    Serves recorded payloads with injected latency and error rate.
+
+    Errors are drawn from a seeded RNG, so a given call sequence
+    fails at the same positions on every run.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        latency_ms: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.directory = directory
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._payloads: Dict[Path, Dict] = {}
+
+    def _load(self, instrument: str, granularity: str) -> Dict:
+        path = recording_path(self.directory, instrument, granularity)
+
+        with self._lock:
+            payload = self._payloads.get(path)
+
+            if payload is None:
+                if not path.exists():
+                    raise FileNotFoundError(
+                        f"No recording for {instrument} {granularity}: {path}"
+                    )
+                payload = json.loads(path.read_text())
+                self._payloads[path] = payload
+
+        return payload
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self._rng.random() < self.error_rate
+
+    def payload(self, instrument: str, granularity: str, count: int) -> Dict:
+        """
+        Recorded payload trimmed to `count` values (newest first, as
+        Twelve Data returns them). Applies latency but NOT error
+        injection; callers decide how to surface failures.
+        """
+
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000.0)
+
+        payload = self._load(instrument, granularity)
+
+        return {
+            **payload,
+            "values": payload["values"][:count],
+        }
+
+
+_replay_store: Optional[ReplayStore] = None
+_replay_store_lock = threading.Lock()
+
+
+def get_replay_store() -> ReplayStore:
+    """
+    Process-wide ReplayStore built from settings. Shared by every
+    provider instance, so the error RNG advances across requests and
+    recordings are read from disk once per process.
+    """
+    global _replay_store
+
+    with _replay_store_lock:
+        if _replay_store is None:
+            settings = get_settings()
+            _replay_store = ReplayStore(
+                directory=settings.forex_record_dir,
+                latency_ms=settings.replay_latency_ms,
+                error_rate=settings.replay_error_rate,
+                seed=settings.replay_seed,
+            )
+
+    return _replay_store
+
+
+class ReplayForexDataProvider(ForexDataProvider):
+    """
+    Offline provider backed by recordings. No network, no API key.
+    """
+
+    def __init__(self, store: Optional[ReplayStore] = None):
+        super().__init__(base_url="replay://", api_key=None)
+        self.store = store or get_replay_store()
+
+    def fetch_payload(
+        self,
+        instrument: str,
+        granularity: str,
+        count: int = 300,
+    ) -> Dict:
+        if self.store.should_fail():
+            raise InjectedReplayError(
+                f"503 Server Error: injected replay error for {instrument}"
+            )
+
+        return self.store.payload(instrument, granularity, count)
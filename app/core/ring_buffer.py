@@ -0,0 +1,306 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+# =========
+# Single series
+# =========
+
+class CandleRingBuffer:
+    """
+    Last `capacity` bars of ONE (symbol, timeframe) series.
+
+    Every column is preallocated at 2 × capacity and each bar is written
+    twice (at i and i + capacity), so the newest `capacity` bars are
+    always one contiguous slice. Appends are O(1) with no reallocation.
+
+    Writes and reads hold a per-buffer lock. frame() returns a private
+    copy, safe to keep while the series keeps updating. The zero-copy
+    paths are explicit: reading() yields a DataFrame over the buffer
+    while holding the lock (read-before-write), view() returns read-only
+    arrays that alias the buffer and change on the next write.
+    """
+
+    def __init__(self, capacity: int = 300):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self._ts = np.zeros(2 * capacity, dtype="int64")   # epoch ns
+        self._cols = {
+            name: np.zeros(2 * capacity, dtype="float64")
+            for name in OHLCV_COLUMNS
+        }
+        self._end = 0       # next write slot in [0, capacity)
+        self._size = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        return self._ts.nbytes + sum(a.nbytes for a in self._cols.values())
+
+    def last_timestamp(self) -> Optional[int]:
+        with self._lock:
+            if self._size == 0:
+                return None
+            return int(self._ts[self._end - 1 + self.capacity])
+
+    # ---------
+    # Writes
+    # ---------
+
+    def _write(self, slot: int, ts: int, values: Tuple[float, ...]):
+        mirror = slot + self.capacity
+        self._ts[slot] = self._ts[mirror] = ts
+
+        for name, value in zip(OHLCV_COLUMNS, values):
+            col = self._cols[name]
+            col[slot] = col[mirror] = value
+
+    def append(
+        self,
+        ts: int,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float = 0.0,
+    ):
+        """
+        Append a new bar (ts in epoch ns).
+        """
+        with self._lock:
+            self._write(self._end, ts, (open_, high, low, close, volume))
+            self._end = (self._end + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+
+    def update_last(
+        self,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float = 0.0,
+    ):
+        """
+        Overwrite the newest bar in place (forming-bar updates).
+        """
+        with self._lock:
+            if self._size == 0:
+                raise IndexError("update_last on empty buffer")
+
+            slot = (self._end - 1) % self.capacity
+            self._write(slot, int(self._ts[slot]), (open_, high, low, close, volume))
+
+    def upsert(
+        self,
+        ts: int,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float = 0.0,
+    ) -> bool:
+        """
+        Single-bar ingest: a newer bar is appended, a bar with the same
+        timestamp as the newest one replaces it, an older bar is ignored
+        (returns False).
+        """
+        with self._lock:
+            last = self.last_timestamp()
+
+            if last is None or ts > last:
+                self.append(ts, open_, high, low, close, volume)
+            elif ts == last:
+                self.update_last(open_, high, low, close, volume)
+            else:
+                return False
+
+        return True
+
+    def extend(self, ts: np.ndarray, values: Dict[str, np.ndarray]):
+        """
+        Bulk append, vectorised. Only the last `capacity` rows are kept.
+        """
+        n = len(ts)
+        if n == 0:
+            return
+
+        if n > self.capacity:
+            ts = ts[-self.capacity:]
+            values = {k: v[-self.capacity:] for k, v in values.items()}
+            n = self.capacity
+
+        with self._lock:
+            slots = (self._end + np.arange(n)) % self.capacity
+            mirrors = slots + self.capacity
+
+            self._ts[slots] = self._ts[mirrors] = ts
+            for name in OHLCV_COLUMNS:
+                col = self._cols[name]
+                col[slots] = col[mirrors] = values[name]
+
+            self._end = (self._end + n) % self.capacity
+            self._size = min(self._size + n, self.capacity)
+
+    def merge(self, ts: np.ndarray, values: Dict[str, np.ndarray]):
+        """
+        Merge bars sorted oldest → newest: newer bars are appended, a
+        bar with the same timestamp as the newest one replaces it, older
+        bars are ignored.
+        """
+        with self._lock:
+            last = self.last_timestamp()
+
+            if last is not None:
+                same = np.flatnonzero(ts == last)
+                if len(same):
+                    i = same[-1]
+                    self.update_last(*(float(values[name][i]) for name in OHLCV_COLUMNS))
+
+                newer = ts > last
+                ts = ts[newer]
+                values = {name: values[name][newer] for name in OHLCV_COLUMNS}
+
+            self.extend(ts, values)
+
+    def ingest(self, df: pd.DataFrame):
+        """
+        Merge a provider frame (see merge).
+        """
+        self.merge(
+            df.index.values.astype("datetime64[ns]").view("int64"),
+            {name: df[name].to_numpy(dtype="float64") for name in OHLCV_COLUMNS},
+        )
+
+    # ---------
+    # Reads
+    # ---------
+
+    def view(
+        self,
+        limit: Optional[int] = None,
+        copy: bool = False,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Contiguous columns, oldest → newest.
+        Keys: "timestamp" (epoch ns) + OHLCV columns.
+
+        Without `copy` these are read-only zero-copy views: they alias
+        the buffer, so a later write changes (and reorders) them. Only
+        use them for work that finishes before the series is written.
+        """
+        with self._lock:
+            size = self._size if limit is None else min(limit, self._size)
+            stop = self._end + self.capacity
+            start = stop - size
+
+            out = {"timestamp": self._ts[start:stop]}
+            for name in OHLCV_COLUMNS:
+                out[name] = self._cols[name][start:stop]
+
+            if copy:
+                return {name: array.copy() for name, array in out.items()}
+
+        for array in out.values():
+            array.flags.writeable = False
+
+        return out
+
+    @staticmethod
+    def _to_frame(columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+        index = pd.DatetimeIndex(
+            columns.pop("timestamp").view("datetime64[ns]"),
+            name="timestamp",
+            copy=False,
+        )
+
+        return pd.DataFrame(columns, index=index, copy=False)
+
+    def frame(self, limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        DataFrame copy of the newest bars, in the same shape the
+        provider returns (timestamp index, OHLCV columns). Independent
+        of later writes to the buffer.
+        """
+        return self._to_frame(self.view(limit, copy=True))
+
+    @contextmanager
+    def reading(self, limit: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Zero-copy, read-only DataFrame of the newest bars, valid ONLY
+        inside the block: writes to this series from other threads wait
+        until it exits. Keep the block to pure reads (e.g. structure
+        detection) and do not let the frame, or anything sliced from
+        it, escape; copy what must outlive the block.
+        """
+        with self._lock:
+            yield self._to_frame(self.view(limit))
+
+
+# =========
+# All live series
+# =========
+
+class CandleStore:
+    """
+    Ring buffers for every (symbol, timeframe) series in the process.
+    Memory is fixed: one buffer of `capacity` bars per series.
+    """
+
+    def __init__(self, capacity: int = 300):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._buffers: Dict[Tuple[str, str], CandleRingBuffer] = {}
+
+    def buffer(self, symbol: str, timeframe: str) -> CandleRingBuffer:
+        key = (symbol, timeframe)
+
+        with self._lock:
+            buf = self._buffers.get(key)
+            if buf is None:
+                buf = self._buffers[key] = CandleRingBuffer(self.capacity)
+
+        return buf
+
+    def get(self, symbol: str, timeframe: str) -> Optional[CandleRingBuffer]:
+        with self._lock:
+            return self._buffers.get((symbol, timeframe))
+
+    def ingest(self, symbol: str, timeframe: str, df: pd.DataFrame) -> CandleRingBuffer:
+        buf = self.buffer(symbol, timeframe)
+        buf.ingest(df)
+        return buf
+
+    def frame(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: Optional[int] = None,
+    ) -> pd.DataFrame:
+        return self.buffer(symbol, timeframe).frame(limit)
+
+    def series(self) -> Dict[Tuple[str, str], CandleRingBuffer]:
+        with self._lock:
+            return dict(self._buffers)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(buf.nbytes for buf in self.series().values())
+
+
+_candle_store = CandleStore()
+
+
+def get_candle_store() -> CandleStore:
+    return _candle_store
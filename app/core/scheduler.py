@@ -0,0 +1,421 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import pandas as pd
+
+from app.core.decision import (
+    DEFAULT_INDEX_SYMBOL,
+    DEFAULT_PARAMS,
+    DEFAULT_TIMEFRAMES,
+    evaluate_signal,
+    strength_timeframe,
+)
+from app.core.market_data import MarketDataService, has_last_closed_bar
+from app.core.state import get_decision_history
+from app.core.timeframes import TIMEFRAME_SECONDS, current_bar
+from app.strategy.alignment import evaluate_alignment
+from app.strategy.currency_strength import MAJOR_CROSSES, split_pair
+from app.strategy.structure import StructureResult, evaluate_structure
+from app.strategy.zone_index import ZoneIndex, get_zone_index
+
+
+SERIES = "series"
+STRUCTURE = "structure"
+ALIGNMENT = "alignment"
+DECISION = "decision"
+
+NODE_KINDS = [SERIES, STRUCTURE, ALIGNMENT, DECISION]
+
+
+# =========
+# Dependency graph
+# =========
+
+@dataclass
+class Node:
+    key: Tuple                              # (kind, symbol[, timeframe])
+    compute: Callable[[], Any]
+    deps: List[Tuple] = field(default_factory=list)
+    fingerprint: Callable[[Any], Hashable] = lambda value: id(value)
+    value: Any = None
+    version: Optional[Hashable] = None
+    runs: int = 0
+
+    @property
+    def kind(self) -> str:
+        return self.key[0]
+
+
+@dataclass
+class CycleReport:
+    timestamp: float
+    due_timeframes: List[str]
+    ran: Dict[str, int]
+    skipped: Dict[str, int]
+    changed: Dict[str, int]
+    failed: Dict[Tuple, str]
+    seconds: float
+    # Due timeframes whose provider had not published the closed bar yet
+    pending_timeframes: List[str] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return sum(self.ran.values()) + sum(self.skipped.values())
+
+    @property
+    def skipped_ratio(self) -> float:
+        return sum(self.skipped.values()) / self.total if self.total else 0.0
+
+    def summary(self) -> str:
+        parts = [
+            f"{kind} {self.ran[kind]}/{self.ran[kind] + self.skipped[kind]}"
+            for kind in NODE_KINDS
+        ]
+        return (
+            f"due {self.due_timeframes or '-'} | ran " + ", ".join(parts)
+            + f" | skipped {self.skipped_ratio:.0%} | failed {len(self.failed)}"
+            + (f" | pending {self.pending_timeframes}" if self.pending_timeframes else "")
+            + f" | {self.seconds * 1000:.0f}ms"
+        )
+
+
+class DependencyGraph:
+    """
+    Nodes run in topological order. A node re-runs only when it is a
+    due source or one of its dependencies CHANGED this cycle; a node
+    whose output fingerprint is unchanged does not wake its dependants.
+    A node that raises keeps its previous value and is retried on the
+    next cycle; dependants without a value yet wait for it.
+    """
+
+    def __init__(self):
+        self.nodes: Dict[Tuple, Node] = {}
+        self._order: Optional[List[Node]] = None
+        self._retry: set = set()
+
+    def add(self, node: Node) -> Node:
+        existing = self.nodes.get(node.key)
+        if existing is not None:
+            return existing
+
+        self.nodes[node.key] = node
+        self._order = None
+        return node
+
+    def value(self, key: Tuple) -> Any:
+        return self.nodes[key].value
+
+    def order(self) -> List[Node]:
+        if self._order is None:
+            order: List[Node] = []
+            state: Dict[Tuple, int] = {}    # 1 visiting, 2 done
+
+            def visit(key: Tuple):
+                mark = state.get(key)
+                if mark == 2:
+                    return
+                if mark == 1:
+                    raise ValueError(f"Dependency cycle at {key}")
+
+                state[key] = 1
+                for dep in self.nodes[key].deps:
+                    visit(dep)
+                state[key] = 2
+                order.append(self.nodes[key])
+
+            for key in self.nodes:
+                visit(key)
+
+            self._order = order
+
+        return self._order
+
+    def run(self, due: List[Tuple], now: float) -> CycleReport:
+        started = time.perf_counter()
+        due_keys = set(due) | self._retry
+        self._retry = set()
+        changed_keys = set()
+
+        ran = {kind: 0 for kind in NODE_KINDS}
+        skipped = {kind: 0 for kind in NODE_KINDS}
+        changed = {kind: 0 for kind in NODE_KINDS}
+        failed: Dict[Tuple, str] = {}
+
+        for node in self.order():
+            needs_run = (
+                node.key in due_keys
+                or node.runs == 0
+                or any(dep in changed_keys for dep in node.deps)
+            )
+            ready = all(self.nodes[dep].runs > 0 for dep in node.deps)
+
+            if not needs_run or not ready:
+                skipped[node.kind] += 1
+                continue
+
+            ran[node.kind] += 1
+            try:
+                value = node.compute()
+            except Exception as e:
+                failed[node.key] = f"{type(e).__name__}: {e}"
+                self._retry.add(node.key)
+                continue
+
+            node.value = value
+            node.runs += 1
+
+            version = node.fingerprint(node.value)
+            if version != node.version:
+                node.version = version
+                changed_keys.add(node.key)
+                changed[node.kind] += 1
+
+        return CycleReport(
+            timestamp=now,
+            due_timeframes=[],
+            ran=ran,
+            skipped=skipped,
+            changed=changed,
+            failed=failed,
+            seconds=time.perf_counter() - started,
+        )
+
+
+# =========
+# Fingerprints
+# =========
+
+def _series_fingerprint(df: pd.DataFrame) -> Hashable:
+    if df.empty:
+        return (0,)
+    last = df.iloc[-1]
+    return (len(df), df.index[-1].value, last.high, last.low, last.close)
+
+
+def _structure_fingerprint(result: StructureResult) -> Hashable:
+    zone = result.zone
+    return (
+        result.valid,
+        result.direction,
+        result.reason,
+        None if zone is None else (zone.lower, zone.upper, zone.bos_index, zone.failure_index),
+    )
+
+
+def _alignment_fingerprint(alignment: Dict) -> Hashable:
+    return (
+        alignment["aligned"],
+        alignment["direction"],
+        tuple(alignment["valid_timeframes"]),
+        alignment["reason"],
+    )
+
+
+def _decision_fingerprint(decision: Dict) -> Hashable:
+    return repr(sorted(decision.items()))
+
+
+class _GraphMarketData(MarketDataService):
+    """
+    Serves evaluate_signal from the graph's node values, so the decision
+    node reuses the frames and structure results computed upstream.
+    """
+
+    def __init__(self, graph: DependencyGraph, fallback: MarketDataService):
+        self.graph = graph
+        self.fallback = fallback
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str, limit: int = 300) -> pd.DataFrame:
+        node = self.graph.nodes.get((SERIES, symbol, timeframe))
+        if node is None:
+            return self.fallback.fetch_ohlcv(symbol, timeframe, limit)
+        return node.value.iloc[-limit:]
+
+    def evaluate_structure_multi_tf(
+        self,
+        symbol: str,
+        timeframes: List[str],
+        failure_validator: Callable,
+        swing_lookback: int = 3,
+    ) -> Dict[str, StructureResult]:
+        return {
+            tf: self.graph.value((STRUCTURE, symbol, tf))
+            for tf in timeframes
+        }
+
+
+# =========
+# Scheduler
+# =========
+
+class EvaluationScheduler:
+    """
+    Re-evaluates a watchlist at bar closes, running only the part of
+
+        series(symbol, tf) → structure(symbol, tf) → alignment(symbol)
+                                                   → decision(symbol)
+
+    whose inputs changed. At a 15m close only the 15m series are
+    refetched; 30m / 1h structure and everything downstream of an
+    unchanged structure is skipped.
+    """
+
+    def __init__(
+        self,
+        watchlist: List[str],
+        index_symbol: str = DEFAULT_INDEX_SYMBOL,
+        timeframes: Optional[List[str]] = None,
+        params: Optional[Dict] = None,
+        market_data: Optional[MarketDataService] = None,
+        zone_index: Optional[ZoneIndex] = None,
+        on_decision: Optional[Callable[[str, Dict], None]] = None,
+    ):
+        self.watchlist = list(watchlist)
+        self.index_symbol = index_symbol
+        self.timeframes = list(timeframes or DEFAULT_TIMEFRAMES)
+        self.params = {**DEFAULT_PARAMS, **(params or {})}
+        self.market_data = market_data or MarketDataService()
+        self.zone_index = zone_index or get_zone_index()
+        self.on_decision = on_decision
+
+        self.graph = DependencyGraph()
+        self._graph_market_data = _GraphMarketData(self.graph, self.market_data)
+        self._last_bars: Dict[str, int] = {}
+
+        for symbol in self.watchlist:
+            self._add_decision(symbol)
+
+    # ---------
+    # Graph construction
+    # ---------
+
+    def _add_series(self, symbol: str, tf: str) -> Tuple:
+        key = (SERIES, symbol, tf)
+        self.graph.add(Node(
+            key=key,
+            compute=lambda: self.market_data.fetch_ohlcv(symbol, tf),
+            fingerprint=_series_fingerprint,
+        ))
+        return key
+
+    def _add_structure(self, symbol: str, tf: str) -> Tuple:
+        key = (STRUCTURE, symbol, tf)
+        series = self._add_series(symbol, tf)
+        self.graph.add(Node(
+            key=key,
+            deps=[series],
+            compute=lambda: evaluate_structure(
+                df=self.graph.value(series),
+                timeframe=tf,
+                failure_validator=lambda idx: True,
+                swing_lookback=self.params["swing_lookback"],
+            ),
+            fingerprint=_structure_fingerprint,
+        ))
+        return key
+
+    def _add_alignment(self, symbol: str) -> Tuple:
+        key = (ALIGNMENT, symbol)
+        structures = [self._add_structure(symbol, tf) for tf in self.timeframes]
+        self.graph.add(Node(
+            key=key,
+            deps=structures,
+            compute=lambda: evaluate_alignment(
+                {tf: self.graph.value((STRUCTURE, symbol, tf)) for tf in self.timeframes},
+                min_aligned=self.params["min_aligned"],
+            ),
+            fingerprint=_alignment_fingerprint,
+        ))
+        return key
+
+    def _add_decision(self, symbol: str) -> Tuple:
+        key = (DECISION, symbol)
+        deps = [self._add_alignment(symbol)]
+        deps += [(SERIES, symbol, tf) for tf in self.timeframes]
+
+        if "USD" in split_pair(symbol):
+            deps.append(self._add_alignment(self.index_symbol))
+        else:
+            strength_tf = strength_timeframe(self.params, self.timeframes)
+            deps += [self._add_series(pair, strength_tf) for pair in MAJOR_CROSSES]
+
+        self.graph.add(Node(
+            key=key,
+            deps=deps,
+            compute=lambda: self._decide(symbol),
+            fingerprint=_decision_fingerprint,
+        ))
+        return key
+
+    def _decide(self, symbol: str) -> Dict:
+        try:
+            decision = evaluate_signal(
+                self._graph_market_data,
+                symbol=symbol,
+                index_symbol=self.index_symbol,
+                timeframes=self.timeframes,
+                params=self.params,
+                zone_index=self.zone_index,
+            )
+        except Exception as e:
+            decision = {"trade_allowed": False, "reason": f"Evaluation error: {e}"}
+
+        key = "|".join([symbol, self.index_symbol, *self.timeframes])
+        get_decision_history().append(key, decision)
+
+        if self.on_decision is not None:
+            self.on_decision(symbol, decision)
+
+        return decision
+
+    # ---------
+    # Cycles
+    # ---------
+
+    def due_timeframes(self, now: float) -> List[str]:
+        """
+        Timeframes that opened a new bar (i.e. closed one) since the
+        cycle that last completed them, i.e. fetched the closed bar for
+        every series. Every timeframe is due on the first cycle.
+        """
+        timeframes = {key[2] for key in self.graph.nodes if key[0] == SERIES}
+        return sorted(
+            (tf for tf in timeframes
+             if self._last_bars.get(tf) != current_bar(tf, now)),
+            key=TIMEFRAME_SECONDS.__getitem__,
+        )
+
+    def run_cycle(self, now: Optional[float] = None) -> CycleReport:
+        now = time.time() if now is None else now
+        due_tfs = self.due_timeframes(now)
+
+        due = [key for key in self.graph.nodes
+               if key[0] == SERIES and key[2] in due_tfs]
+
+        report = self.graph.run(due, now)
+        report.due_timeframes = due_tfs
+
+        for tf in due_tfs:
+            # Done only once every series has the bar that closed; until
+            # then the timeframe stays due and is refetched next cycle
+            if all(
+                key not in report.failed
+                and self.graph.nodes[key].value is not None
+                and has_last_closed_bar(self.graph.nodes[key].value, tf, now)
+                for key in due if key[2] == tf
+            ):
+                self._last_bars[tf] = current_bar(tf, now)
+            else:
+                report.pending_timeframes.append(tf)
+
+        return report
+
+    def decision(self, symbol: str) -> Optional[Dict]:
+        node = self.graph.nodes.get((DECISION, symbol))
+        return None if node is None else node.value
+
+    def seconds_until_next_close(self, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        fastest = min(self.timeframes, key=TIMEFRAME_SECONDS.__getitem__)
+        return current_bar(fastest, now) + TIMEFRAME_SECONDS[fastest] - now
@@ -0,0 +1,322 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.config import get_settings
+
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+# Bumped whenever the tables (or the payloads stored in them) change;
+# older cache files are rebuilt
+_SCHEMA_VERSION = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candles (
+    key      TEXT PRIMARY KEY,
+    bar      INTEGER NOT NULL,
+    rows     INTEGER NOT NULL,
+    ts       BLOB NOT NULL,
+    ohlcv    BLOB NOT NULL,
+    complete INTEGER NOT NULL,
+    updated  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS decisions (
+    key      TEXT PRIMARY KEY,
+    bar      INTEGER NOT NULL,
+    payload  TEXT NOT NULL,
+    complete INTEGER NOT NULL,
+    updated  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS refresh_locks (
+    key     TEXT PRIMARY KEY,
+    owner   TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+"""
+
+
+# =========
+# Candle (de)serialization
+# =========
+
+def _encode_frame(df: pd.DataFrame):
+    ts = df.index.values.astype("datetime64[ns]").view("int64")
+    ohlcv = np.ascontiguousarray(
+        df[OHLCV_COLUMNS].to_numpy(dtype="float64")
+    )
+    return len(df), ts.tobytes(), ohlcv.tobytes()
+
+
+def _decode_frame(rows: int, ts: bytes, ohlcv: bytes) -> pd.DataFrame:
+    index = pd.to_datetime(np.frombuffer(ts, dtype="int64"), unit="ns")
+    values = np.frombuffer(ohlcv, dtype="float64").reshape(rows, len(OHLCV_COLUMNS))
+
+    df = pd.DataFrame(values.copy(), index=index, columns=OHLCV_COLUMNS)
+    df.index.name = "timestamp"
+
+    return df
+
+
+# =========
+# Shared cache
+# =========
+
+class SharedCache:
+    """
+    Candle / decision cache shared by every process on one host.
+
+    Backed by a single SQLite file (WAL mode). Entries are tagged with
+    the bar they belong to, so they expire naturally when the next bar
+    opens. Refreshes are guarded by a lease row in `refresh_locks`, so
+    only ONE worker calls the provider for a given key per bar; the
+    others poll the table until the result lands.
+
+    An entry built before the provider published the bar that just
+    closed is stored as incomplete and only served for `stale_ttl`
+    seconds, so a refresh right after a close cannot pin stale candles
+    (or the decision built from them) for the whole bar.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        lock_ttl: float = 30.0,
+        poll_interval: float = 0.05,
+        stale_ttl: float = 5.0,
+    ):
+        self.path = path
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+        self.stale_ttl = stale_ttl
+        self._local = threading.local()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            (version,) = conn.execute("PRAGMA user_version").fetchone()
+            if version != _SCHEMA_VERSION:
+                # Cache contents are disposable: rebuild instead of migrating
+                for table in ("candles", "decisions", "refresh_locks"):
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+                conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        conn.executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.lock_ttl,
+                isolation_level=None,   # explicit transactions only
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+
+        return conn
+
+    # ---------
+    # Candles
+    # ---------
+
+    def _fresh_after(self) -> float:
+        return time.time() - self.stale_ttl
+
+    def get_candles(self, key: str, bar: int) -> Optional[pd.DataFrame]:
+        row = self._connection().execute(
+            "SELECT rows, ts, ohlcv FROM candles"
+            " WHERE key = ? AND bar = ? AND (complete OR updated > ?)",
+            (key, bar, self._fresh_after()),
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return _decode_frame(*row)
+
+    def put_candles(
+        self,
+        key: str,
+        bar: int,
+        df: pd.DataFrame,
+        complete: bool = True,
+    ):
+        rows, ts, ohlcv = _encode_frame(df)
+
+        self._connection().execute(
+            "INSERT OR REPLACE INTO candles VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, bar, rows, ts, ohlcv, int(complete), time.time()),
+        )
+
+    # ---------
+    # Decisions
+    # ---------
+
+    def get_decision(self, key: str, bar: int) -> Optional[Dict]:
+        row = self._connection().execute(
+            "SELECT payload FROM decisions"
+            " WHERE key = ? AND bar = ? AND (complete OR updated > ?)",
+            (key, bar, self._fresh_after()),
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return json.loads(row[0])
+
+    def put_decision(
+        self,
+        key: str,
+        bar: int,
+        decision: Dict,
+        complete: bool = True,
+    ):
+        self._connection().execute(
+            "INSERT OR REPLACE INTO decisions VALUES (?, ?, ?, ?, ?)",
+            (key, bar, json.dumps(decision), int(complete), time.time()),
+        )
+
+    # ---------
+    # Cross-process refresh lease
+    # ---------
+
+    def _owner(self) -> str:
+        return f"{os.getpid()}:{threading.get_ident()}"
+
+    def try_acquire(self, key: str) -> bool:
+        conn = self._connection()
+        now = time.time()
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT owner, expires FROM refresh_locks WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is not None and row[1] > now and row[0] != self._owner():
+                conn.execute("ROLLBACK")
+                return False
+
+            conn.execute(
+                "INSERT OR REPLACE INTO refresh_locks VALUES (?, ?, ?)",
+                (key, self._owner(), now + self.lock_ttl),
+            )
+            conn.execute("COMMIT")
+            return True
+
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def release(self, key: str):
+        self._connection().execute(
+            "DELETE FROM refresh_locks WHERE key = ? AND owner = ?",
+            (key, self._owner()),
+        )
+
+    def _get_or_refresh(
+        self,
+        lock_key: str,
+        lookup: Callable,
+        produce: Callable,
+        store: Callable,
+    ):
+        deadline = time.time() + self.lock_ttl
+
+        while True:
+            cached = lookup()
+            if cached is not None:
+                return cached
+
+            if self.try_acquire(lock_key):
+                try:
+                    # Another worker may have finished between lookup and lease
+                    cached = lookup()
+                    if cached is not None:
+                        return cached
+
+                    value = produce()
+                    store(value)
+                    return value
+                finally:
+                    self.release(lock_key)
+
+            if time.time() > deadline:
+                # Lease holder is stuck or gone — do the work ourselves
+                return produce()
+
+            time.sleep(self.poll_interval)
+
+    def get_or_refresh_candles(
+        self,
+        key: str,
+        bar: int,
+        fetch: Callable[[], pd.DataFrame],
+        is_complete: Callable[[pd.DataFrame], bool] = lambda df: True,
+    ) -> pd.DataFrame:
+        return self._get_or_refresh(
+            lock_key=f"candles:{key}:{bar}",
+            lookup=lambda: self.get_candles(key, bar),
+            produce=fetch,
+            store=lambda df: self.put_candles(key, bar, df, is_complete(df)),
+        )
+
+    def get_or_refresh_decision(
+        self,
+        key: str,
+        bar: int,
+        evaluate: Callable[[], Dict],
+        is_complete: Callable[[Dict], bool] = lambda decision: True,
+    ) -> Dict:
+        return self._get_or_refresh(
+            lock_key=f"decision:{key}:{bar}",
+            lookup=lambda: self.get_decision(key, bar),
+            produce=evaluate,
+            store=lambda decision: self.put_decision(
+                key, bar, decision, is_complete(decision)
+            ),
+        )
+
+
+_shared_cache: Optional[SharedCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache() -> Optional[SharedCache]:
+    """
+    Process-wide SharedCache, or None when disabled in settings.
+    """
+    global _shared_cache
+
+    settings = get_settings()
+
+    if not settings.shared_cache_enabled:
+        return None
+
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = SharedCache(
+                path=settings.shared_cache_path,
+                lock_ttl=settings.shared_cache_lock_ttl,
+                stale_ttl=settings.shared_cache_stale_ttl,
+            )
+
+    return _shared_cache
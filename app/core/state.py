@@ -0,0 +1,364 @@
+import json
+import os
+import struct
+import threading
+import time
+from collections import deque
+from dataclasses import asdict
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+
+import numpy as np
+
+from app.core.ring_buffer import OHLCV_COLUMNS, CandleStore, get_candle_store
+from app.strategy.structure import StructureZone
+from app.strategy.zone_index import ZoneIndex, ZoneRecord, get_zone_index
+
+
+# =========
+# Decision history
+# =========
+
+class DecisionHistory:
+    """
+    Bounded in-memory history of evaluated decisions (newest last).
+    """
+
+    def __init__(self, maxlen: int = 1000):
+        self._lock = threading.Lock()
+        self._items: Deque[Dict] = deque(maxlen=maxlen)
+
+    def append(self, key: str, decision: Dict, timestamp: Optional[float] = None):
+        with self._lock:
+            self._items.append({
+                "timestamp": time.time() if timestamp is None else timestamp,
+                "key": key,
+                "decision": decision,
+            })
+
+    def items(self) -> List[Dict]:
+        with self._lock:
+            return list(self._items)
+
+    def latest(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            for item in reversed(self._items):
+                if item["key"] == key:
+                    return item
+        return None
+
+    def load(self, items: List[Dict]):
+        """
+        Merge restored items into the history, keeping time order.
+        Items are unique per (key, timestamp): each snapshot generation
+        carries the earlier ones' items, so they are not added twice.
+        """
+        with self._lock:
+            merged = {
+                (item["key"], item["timestamp"]): item
+                for item in [*self._items, *items]
+            }
+            self._items.clear()
+            self._items.extend(sorted(merged.values(), key=lambda item: item["timestamp"]))
+
+
+_decision_history = DecisionHistory()
+
+
+def get_decision_history() -> DecisionHistory:
+    return _decision_history
+
+
+# =========
+# Snapshot file format
+# =========
+#
+#   b"SSBSNAP1" | uint64 header length | JSON header | padding | arrays
+#
+# The header lists each series (symbol, timeframe, capacity, start,
+# length), the zone records and the decision history. Candle columns
+# are stored as flat little-endian arrays at 64-byte aligned offsets,
+# so restore can np.memmap them instead of reading the whole file.
+
+MAGIC = b"SSBSNAP1"
+_ALIGN = 64
+_ARRAYS = [("timestamp", "<i8")] + [(name, "<f8") for name in OHLCV_COLUMNS]
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _zone_to_dict(record: ZoneRecord) -> Dict:
+    data = asdict(record)
+    data["zone"] = {
+        k: float(v) if isinstance(v, np.floating) else v
+        for k, v in data["zone"].items()
+    }
+    return data
+
+
+def _zone_from_dict(data: Dict) -> ZoneRecord:
+    return ZoneRecord(**{**data, "zone": StructureZone(**data["zone"])})
+
+
+def write_snapshot(
+    path: str,
+    store: CandleStore,
+    zone_index: ZoneIndex,
+    history: DecisionHistory,
+) -> Dict:
+    """
+    Atomically write a snapshot. Returns the header that was written.
+    """
+
+    series = []
+    columns: Dict[str, List[np.ndarray]] = {name: [] for name, _ in _ARRAYS}
+    total = 0
+
+    for (symbol, timeframe), buffer in sorted(store.series().items()):
+        view = buffer.view(copy=True)   # consistent while live writes go on
+        length = len(view["timestamp"])
+
+        series.append({
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "capacity": buffer.capacity,
+            "start": total,
+            "length": length,
+        })
+        for name, _ in _ARRAYS:
+            columns[name].append(view[name])
+
+        total += length
+
+    header = {
+        "version": 1,
+        "created": time.time(),
+        "rows": total,
+        "series": series,
+        "zones": [_zone_to_dict(r) for r in zone_index.records()],
+        "decisions": history.items(),
+        "arrays": {},
+    }
+
+    # Offsets depend on the header size and the header holds the
+    # offsets: grow the data start until the encoded header fits.
+    data_start = 0
+    while True:
+        offset = data_start
+        for name, dtype in _ARRAYS:
+            header["arrays"][name] = {"dtype": dtype, "offset": offset}
+            offset = _aligned(offset + total * np.dtype(dtype).itemsize)
+
+        raw_header = json.dumps(header, default=float).encode()
+        needed = _aligned(len(MAGIC) + 8 + len(raw_header))
+
+        if needed <= data_start:
+            break
+        data_start = needed
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"   # workers may snapshot concurrently
+
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(raw_header)))
+        f.write(raw_header)
+
+        for name, dtype in _ARRAYS:
+            f.seek(header["arrays"][name]["offset"])
+            parts = columns[name]
+            if parts:
+                f.write(np.concatenate(parts).astype(dtype, copy=False).tobytes())
+
+        f.truncate(max(offset, f.tell()))
+
+    os.replace(tmp, path)
+    return header
+
+
+def read_snapshot_header(path: str) -> Dict:
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a state snapshot: {path}")
+
+        (length,) = struct.unpack("<Q", f.read(8))
+        return json.loads(f.read(length))
+
+
+def restore_snapshot(
+    path: str,
+    store: CandleStore,
+    zone_index: ZoneIndex,
+    history: DecisionHistory,
+) -> Dict:
+    """
+    Merge a snapshot into the live store / zone index / history.
+    Candle columns are memory-mapped and copied straight into the
+    preallocated ring buffers; only bars newer than (or equal to) the
+    newest one a buffer already holds are taken, so several snapshots
+    can be restored one after the other, oldest first.
+    """
+
+    header = read_snapshot_header(path)
+    rows = header["rows"]
+
+    arrays = {
+        name: np.memmap(
+            path,
+            dtype=spec["dtype"],
+            mode="r",
+            offset=spec["offset"],
+            shape=(rows,),
+        ) if rows else np.empty(0, dtype=spec["dtype"])
+        for name, spec in header["arrays"].items()
+    }
+
+    for s in header["series"]:
+        window = slice(s["start"], s["start"] + s["length"])
+        buffer = store.buffer(s["symbol"], s["timeframe"])
+
+        buffer.merge(
+            arrays["timestamp"][window],
+            {name: arrays[name][window] for name in OHLCV_COLUMNS},
+        )
+
+    zone_index.load_records([_zone_from_dict(z) for z in header["zones"]])
+    history.load(header["decisions"])
+
+    return header
+
+
+# =========
+# Per-worker snapshot files
+# =========
+#
+# Every process (uvicorn worker) snapshots its own state to
+# <stem>.<pid><suffix> next to the configured path, so workers never
+# overwrite each other. Restore merges all of them.
+
+def worker_snapshot_path(path: str, pid: Optional[int] = None) -> str:
+    """
+    app/state/snapshot.bin → app/state/snapshot.<pid>.bin
+    """
+    p = Path(path)
+    return str(p.with_name(f"{p.stem}.{pid or os.getpid()}{p.suffix}"))
+
+
+def snapshot_paths(path: str) -> List[str]:
+    """
+    Every worker snapshot for `path` (plus `path` itself, if a single
+    snapshot was written there), oldest first.
+    """
+    p = Path(path)
+    paths = []
+
+    for candidate in p.parent.glob(f"{p.stem}.*{p.suffix}"):
+        pid = candidate.name[len(p.stem) + 1:len(candidate.name) - len(p.suffix)]
+        if pid.isdigit():
+            paths.append(candidate)
+
+    if p.exists():
+        paths.append(p)
+
+    return [str(x) for x in sorted(paths, key=lambda x: x.stat().st_mtime)]
+
+
+def prune_snapshots(path: str, keep: str, max_age: float) -> List[str]:
+    """
+    Delete snapshots not written for `max_age` seconds (their worker is
+    gone), except `keep`. Returns the deleted paths.
+    """
+    cutoff = time.time() - max_age
+    deleted = []
+
+    for candidate in snapshot_paths(path):
+        if candidate == keep:
+            continue
+        try:
+            if os.path.getmtime(candidate) < cutoff:
+                os.remove(candidate)
+                deleted.append(candidate)
+        except OSError:
+            pass    # another worker pruned it first
+
+    return deleted
+
+
+# =========
+# Periodic snapshots
+# =========
+
+class StateManager:
+    """
+    Restores state on startup and snapshots it every `interval` seconds
+    on a daemon thread (plus once more on stop).
+
+    `path` is the configured snapshot path; this process writes its own
+    worker file next to it, restores from every worker file, and prunes
+    files no live worker has refreshed for 3 intervals (restore runs at
+    startup, well before the first prune).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        interval: float = 60.0,
+        store: Optional[CandleStore] = None,
+        zone_index: Optional[ZoneIndex] = None,
+        history: Optional[DecisionHistory] = None,
+    ):
+        self.base_path = path
+        self.path = worker_snapshot_path(path)
+        self.interval = interval
+        self.store = store or get_candle_store()
+        self.zone_index = zone_index or get_zone_index()
+        self.history = history or get_decision_history()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def snapshot(self) -> Dict:
+        return write_snapshot(self.path, self.store, self.zone_index, self.history)
+
+    def restore(self) -> List[Dict]:
+        """
+        Merge every worker snapshot, oldest first, so the newest data
+        wins. Returns the restored headers (empty on a cold start).
+        A corrupt snapshot is reported and skipped.
+        """
+        headers = []
+
+        for path in snapshot_paths(self.base_path):
+            try:
+                headers.append(
+                    restore_snapshot(path, self.store, self.zone_index, self.history)
+                )
+            except (ValueError, OSError, KeyError) as e:
+                print(f"⚠️ Ignoring unreadable state snapshot {path}: {e}")
+
+        return headers
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.snapshot()
+                prune_snapshots(self.base_path, keep=self.path, max_age=3 * self.interval)
+            except Exception as e:
+                print(f"⚠️ State snapshot failed: {e}")
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="state-snapshot", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, final_snapshot: bool = True):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if final_snapshot:
+            self.snapshot()
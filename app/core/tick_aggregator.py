@@ -0,0 +1,324 @@
+import asyncio
+import csv
+import threading
+from pathlib import Path
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+import pandas as pd
+
+from app.core.ring_buffer import CandleStore, get_candle_store
+from app.core.timeframes import TIMEFRAME_SECONDS
+
+
+DEFAULT_TICK_TIMEFRAMES = ["5m", "15m", "30m", "1h"]
+
+_NS = 1_000_000_000
+
+
+# =========
+# Data Models
+# =========
+
+@dataclass
+class Tick:
+    timestamp: float    # epoch seconds, UTC
+    price: float
+    volume: float = 0.0
+
+
+class FormingBar:
+    __slots__ = ("open_time", "open", "high", "low", "close", "volume")
+
+    def __init__(self, open_time: int, price: float, volume: float):
+        self.open_time = open_time      # epoch seconds
+        self.open = price
+        self.high = price
+        self.low = price
+        self.close = price
+        self.volume = volume
+
+    def as_dict(self) -> Dict:
+        return {
+            "timestamp": pd.Timestamp(self.open_time, unit="s"),
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+        }
+
+
+# =========
+# Aggregation
+# =========
+
+class TickAggregator:
+    """
+    Builds OHLCV bars for several timeframes from ONE tick stream,
+    in a single pass per tick.
+
+    Closed bars are merged into the symbol's ring buffers in the
+    CandleStore (the same series MarketDataService fills) with ingest
+    semantics: a bar the provider already stored (e.g. as a forming
+    bar) is replaced, never duplicated, and bars older than the newest
+    stored one are dropped. The forming bar is kept per timeframe and
+    can be read at any time.
+    Ticks older than the fastest forming bar are counted and dropped.
+
+    Register the aggregator (register_tick_aggregator) to have the
+    decision engine check entries against the live forming bar.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        timeframes: Optional[List[str]] = None,
+        store: Optional[CandleStore] = None,
+        on_bar_close: Optional[Callable[[str, str, FormingBar], None]] = None,
+    ):
+        self.symbol = symbol
+        self.timeframes = list(timeframes or DEFAULT_TICK_TIMEFRAMES)
+        self.store = store or get_candle_store()
+        self.on_bar_close = on_bar_close
+
+        # Parallel lists keep the per-tick loop free of dict lookups
+        self._seconds = [TIMEFRAME_SECONDS[tf] for tf in self.timeframes]
+        self._buffers = [self.store.buffer(symbol, tf) for tf in self.timeframes]
+        self._forming: List[Optional[FormingBar]] = [None] * len(self.timeframes)
+
+        # Open time of the fastest forming bar; older ticks are late
+        self._min_seconds = min(self._seconds)
+        self._watermark = float("-inf")
+
+        self.ticks = 0
+        self.late_ticks = 0
+        self.dropped_bars = 0
+
+    def on_tick(self, timestamp: float, price: float, volume: float = 0.0):
+        if timestamp < self._watermark:
+            self.late_ticks += 1
+            return
+
+        self.ticks += 1
+        forming = self._forming
+
+        for i, seconds in enumerate(self._seconds):
+            bar = forming[i]
+            open_time = int(timestamp // seconds) * seconds
+
+            if bar is not None and open_time == bar.open_time:
+                if price > bar.high:
+                    bar.high = price
+                elif price < bar.low:
+                    bar.low = price
+                bar.close = price
+                bar.volume += volume
+                continue
+
+            if bar is not None:
+                self._close(i, bar)
+
+            forming[i] = FormingBar(open_time, price, volume)
+
+        self._watermark = int(timestamp // self._min_seconds) * self._min_seconds
+
+    def _close(self, i: int, bar: FormingBar):
+        stored = self._buffers[i].upsert(
+            bar.open_time * _NS,
+            bar.open,
+            bar.high,
+            bar.low,
+            bar.close,
+            bar.volume,
+        )
+
+        if not stored:
+            # Provider already holds newer bars for this series
+            self.dropped_bars += 1
+
+        if self.on_bar_close is not None:
+            self.on_bar_close(self.symbol, self.timeframes[i], bar)
+
+    def flush(self):
+        """
+        Close every forming bar (end of a replay / feed shutdown).
+        """
+        for i, bar in enumerate(self._forming):
+            if bar is not None:
+                self._close(i, bar)
+                self._forming[i] = None
+
+    # ---------
+    # Reads (strategy layer)
+    # ---------
+
+    def forming_bar(self, timeframe: str) -> Optional[FormingBar]:
+        return self._forming[self.timeframes.index(timeframe)]
+
+    def frame(
+        self,
+        timeframe: str,
+        include_forming: bool = True,
+        limit: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Closed bars plus, optionally, the forming bar
+        as the last row — so validate_entry_candle(df, len(df) - 1, ...)
+        checks the live bar instead of the last closed one.
+        """
+        closed = self.store.frame(self.symbol, timeframe, limit)
+        bar = self.forming_bar(timeframe)
+
+        if not include_forming or bar is None:
+            return closed
+
+        # The provider may already hold this bar (as its forming bar)
+        closed = closed[closed.index < pd.Timestamp(bar.open_time, unit="s")]
+
+        row = bar.as_dict()
+        forming = pd.DataFrame(
+            [row], index=pd.DatetimeIndex([row.pop("timestamp")], name="timestamp")
+        ).astype("float64")
+
+        df = pd.concat([closed, forming])
+        return df.iloc[-limit:] if limit else df
+
+    # ---------
+    # Feed drivers
+    # ---------
+
+    def run(self, feed: Iterable[Tick]) -> int:
+        on_tick = self.on_tick
+        for tick in feed:
+            on_tick(tick.timestamp, tick.price, tick.volume)
+        return self.ticks
+
+    async def arun(self, feed: AsyncIterator[Tick]) -> int:
+        on_tick = self.on_tick
+        async for tick in feed:
+            on_tick(tick.timestamp, tick.price, tick.volume)
+        return self.ticks
+
+
+# =========
+# Live aggregators
+# =========
+
+_aggregators: Dict[str, TickAggregator] = {}
+_aggregators_lock = threading.Lock()
+
+
+def register_tick_aggregator(aggregator: TickAggregator):
+    """
+    Make `aggregator` the live tick source for its symbol, so
+    MarketDataService.fetch_entry_frame serves its forming bars.
+    """
+    with _aggregators_lock:
+        _aggregators[aggregator.symbol] = aggregator
+
+
+def unregister_tick_aggregator(symbol: str):
+    with _aggregators_lock:
+        _aggregators.pop(symbol, None)
+
+
+def get_tick_aggregator(symbol: str) -> Optional[TickAggregator]:
+    with _aggregators_lock:
+        return _aggregators.get(symbol)
+
+
+# =========
+# Feeds
+# =========
+
+class ReplayTickFeed:
+    """
+    Ticks from a local CSV file: timestamp,price[,volume]
+    (timestamp in epoch seconds). A header row is skipped.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __iter__(self) -> Iterator[Tick]:
+        with open(self.path, newline="") as f:
+            for row in csv.reader(f):
+                if not row or row[0] == "timestamp":
+                    continue
+
+                yield Tick(
+                    timestamp=float(row[0]),
+                    price=float(row[1]),
+                    volume=float(row[2]) if len(row) > 2 else 0.0,
+                )
+
+
+class CcxtTickFeed:
+    """
+    Live trades from a ccxt.pro exchange websocket.
+    Observation only — no orders are ever sent.
+    """
+
+    def __init__(self, exchange_id: str, symbol: str):
+        self.exchange_id = exchange_id
+        self.symbol = symbol
+
+    async def __aiter__(self) -> AsyncIterator[Tick]:
+        import ccxt.pro as ccxtpro
+
+        exchange = getattr(ccxtpro, self.exchange_id)({"enableRateLimit": True})
+
+        try:
+            while True:
+                trades = await exchange.watch_trades(self.symbol)
+                for trade in trades:
+                    yield Tick(
+                        timestamp=trade["timestamp"] / 1000.0,
+                        price=float(trade["price"]),
+                        volume=float(trade.get("amount") or 0.0),
+                    )
+        finally:
+            await exchange.close()
+
+
+# =========
+# Feed threads
+# =========
+
+def replay_tick_path(directory: str, symbol: str) -> Path:
+    """
+    One CSV per symbol, e.g. EURUSD.csv
+    """
+    return Path(directory) / f"{symbol.replace('/', '')}.csv"
+
+
+def start_tick_feed(
+    aggregator: TickAggregator,
+    feed: Union[Iterable[Tick], AsyncIterator[Tick]],
+) -> threading.Thread:
+    """
+    Register `aggregator` and drive it from `feed` on a daemon thread
+    (async feeds get their own event loop). The aggregator is
+    unregistered when the feed ends or fails, so entries fall back to
+    provider candles.
+    """
+
+    def run():
+        try:
+            if hasattr(feed, "__aiter__"):
+                asyncio.run(aggregator.arun(feed))
+            else:
+                aggregator.run(feed)
+        except Exception as e:
+            print(f"⚠️ Tick feed for {aggregator.symbol} stopped: {e}")
+        finally:
+            unregister_tick_aggregator(aggregator.symbol)
+
+    register_tick_aggregator(aggregator)
+
+    thread = threading.Thread(
+        target=run, name=f"tick-feed-{aggregator.symbol}", daemon=True
+    )
+    thread.start()
+    return thread
@@ -1,6 +1,32 @@
+import time
+from typing import Optional
+
 TIMEFRAME_MAP = {
     "1h": "1h",
     "30m": "30min",
     "15m": "15min",
     "5m": "5min",
 }
+
+TIMEFRAME_SECONDS = {
+    "1h": 60 * 60,
+    "30m": 30 * 60,
+    "15m": 15 * 60,
+    "5m": 5 * 60,
+}
+
+
+def current_bar(timeframe: str, now: Optional[float] = None) -> int:
+    """
+    Open time (epoch seconds, UTC) of the bar that is forming at `now`.
+    """
+    seconds = TIMEFRAME_SECONDS[timeframe]
+    now = time.time() if now is None else now
+    return int(now // seconds) * seconds
+
+
+def last_closed_bar(timeframe: str, now: Optional[float] = None) -> int:
+    """
+    Open time (epoch seconds, UTC) of the most recently CLOSED bar.
+    """
+    return current_bar(timeframe, now) - TIMEFRAME_SECONDS[timeframe]
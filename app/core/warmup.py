@@ -0,0 +1,101 @@
+import threading
+import time
+from typing import Optional
+
+from app.config import get_settings
+
+# =========================
+# Background warm-up
+# =========================
+#
+# app.main only imports FastAPI and the routers; pandas / numpy / the
+# strategy engine and the state restore are loaded here, on a thread,
+# so the process accepts connections (health checks) immediately.
+
+_warm = threading.Event()
+_started = False
+_lock = threading.Lock()
+_state = None
+
+warm_up_seconds: Optional[float] = None
+
+
+def _warm_up():
+    global _state, warm_up_seconds
+
+    started = time.perf_counter()
+
+    try:
+        import app.core.decision  # noqa: F401  pandas, numpy, strategy engine
+
+        settings = get_settings()
+
+        if settings.state_enabled:
+            from app.core.state import StateManager
+
+            # Restore candles / zones / decisions from the last snapshots,
+            # so the first refresh of a series only asks the provider for
+            # the bars that closed since (with the shared cache too: the
+            # refreshing worker fetches a delta onto its restored buffer)
+            _state = StateManager(
+                path=settings.state_snapshot_path,
+                interval=settings.state_snapshot_interval,
+            )
+            _state.restore()
+            _state.start()
+
+        if settings.tick_feed:
+            _start_tick_feeds(settings)
+
+    except Exception as e:
+        print(f"⚠️ Warm-up failed: {e}")
+
+    finally:
+        warm_up_seconds = time.perf_counter() - started
+        _warm.set()
+
+
+def _start_tick_feeds(settings):
+    from app.core.tick_aggregator import (
+        CcxtTickFeed,
+        ReplayTickFeed,
+        TickAggregator,
+        replay_tick_path,
+        start_tick_feed,
+    )
+
+    for symbol in settings.tick_symbols:
+        if settings.tick_feed == "replay":
+            feed = ReplayTickFeed(str(replay_tick_path(settings.tick_replay_dir, symbol)))
+        elif settings.tick_feed == "ccxt":
+            feed = CcxtTickFeed(settings.tick_exchange, symbol)
+        else:
+            raise ValueError(f"Unknown TICK_FEED: {settings.tick_feed}")
+
+        start_tick_feed(TickAggregator(symbol), feed)
+
+
+def start_warm_up():
+    global _started
+
+    with _lock:
+        if _started:
+            return
+        _started = True
+
+    threading.Thread(target=_warm_up, name="warm-up", daemon=True).start()
+
+
+def wait_until_warm(timeout: float = 30.0) -> bool:
+    """
+    Block until warm-up finished. Returns immediately when warm-up was
+    never started (scripts, tests without the app lifespan).
+    """
+    if not _started:
+        return True
+    return _warm.wait(timeout)
+
+
+def shutdown():
+    if _state is not None:
+        _state.stop()
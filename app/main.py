@@ -1,7 +1,21 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from app.api import signal, bot
+from app.core import warmup
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Heavy imports + state restore run in the background
+    warmup.start_warm_up()
+
+    yield
+
+    warmup.shutdown()
+
 
-app = FastAPI(title="Bot backend")
+app = FastAPI(title="Bot backend", lifespan=lifespan)
 
 app.include_router(signal.router, prefix="/signal")
 app.include_router(bot.router, prefix="/bot")
@@ -0,0 +1,116 @@
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+# =========================
+# CONFIGURATION
+# =========================
+#
+# Point the API at recorded data first, e.g.
+#   FOREX_PROVIDER_MODE=replay REPLAY_LATENCY_MS=150 uvicorn app.main:app
+# and set SHARED_CACHE_ENABLED=0 to measure full evaluations rather
+# than cache hits.
+
+BASE_URL = "http://127.0.0.1:8000"
+DEFAULT_PATHS = ["/signal/"]
+
+
+# =========================
+# HELPERS
+# =========================
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+
+    rank = max(0, min(len(sorted_values) - 1,
+                      int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def run_load_test(
+    base_url: str = BASE_URL,
+    paths: Optional[List[str]] = None,
+    concurrency: int = 10,
+    total_requests: int = 200,
+    timeout: float = 20.0,
+) -> Dict:
+    """
+    Fire `total_requests` GETs across `concurrency` threads,
+    round-robin over `paths`. Returns throughput and latency stats (ms).
+    """
+
+    paths = paths or DEFAULT_PATHS
+    local = threading.local()
+
+    def one(i: int):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+
+        url = base_url.rstrip("/") + paths[i % len(paths)]
+        started = time.perf_counter()
+
+        try:
+            response = session.get(url, timeout=timeout)
+            ok = response.status_code < 400
+        except requests.RequestException:
+            ok = False
+
+        return ok, (time.perf_counter() - started) * 1000.0
+
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(total_requests)))
+
+    elapsed = time.perf_counter() - started
+    latencies = sorted(ms for _, ms in results)
+    errors = sum(1 for ok, _ in results if not ok)
+
+    return {
+        "requests": total_requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(total_requests / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+    }
+
+
+# =========================
+# ENTRY POINT
+# =========================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the /signal API")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--path", action="append", dest="paths")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=20.0)
+    args = parser.parse_args()
+
+    report = run_load_test(
+        base_url=args.base_url,
+        paths=args.paths,
+        concurrency=args.concurrency,
+        total_requests=args.requests,
+        timeout=args.timeout,
+    )
+
+    print(f"📊 {report['requests']} requests @ concurrency {report['concurrency']}")
+    print(f"⏱ {report['elapsed_s']}s | {report['throughput_rps']} req/s | "
+          f"errors: {report['errors']}")
+    print(f"p50 {report['p50_ms']}ms | p95 {report['p95_ms']}ms | "
+          f"p99 {report['p99_ms']}ms | max {report['max_ms']}ms")
@@ -4,6 +4,8 @@ import requests
 from datetime import datetime
 from pathlib import Path
 
+from app.runner.phase2_store import convert_jsonl
+
 # =========================
 # CONFIGURATION
 # =========================
@@ -30,6 +32,21 @@ def get_log_file_path() -> Path:
     return LOG_DIR / f"phase2_{today}.jsonl"
 
 
+def compact_previous_days():
+    """
+    Convert finished days (every JSONL file but today's) to the
+    columnar .p2c format used by app.runner.phase2_query.
+    """
+    today = get_log_file_path()
+
+    for path in sorted(LOG_DIR.glob("phase2_*.jsonl")):
+        if path != today and not path.with_suffix(".p2c").exists():
+            try:
+                convert_jsonl(path)
+            except Exception as e:
+                print(f"❌ Could not compact {path.name}: {e}")
+
+
 def log_entry(entry: dict):
     """
     Append a single JSON entry to the log file.
@@ -50,7 +67,10 @@ def run_logger():
     print("Press Ctrl+C to stop\n")
 
     while True:
+        compact_previous_days()
+
         timestamp = datetime.utcnow().isoformat()
+        started = time.perf_counter()
 
         try:
             response = requests.get(
@@ -65,6 +85,7 @@ def run_logger():
                 "timestamp": timestamp,
                 "symbol": SYMBOL,
                 "timeframes": TIMEFRAMES,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 2),
                 **decision,
             })
 
@@ -75,6 +96,7 @@ def run_logger():
             log_entry({
                 "timestamp": timestamp,
                 "error": str(e),
+                "latency_ms": round((time.perf_counter() - started) * 1000, 2),
             })
 
             print(f"[{timestamp}] ❌ Error logged: {e}")
@@ -0,0 +1,201 @@
+import argparse
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.runner.phase2_store import (
+    KIND_DECISION,
+    KIND_ERROR,
+    convert_dir,
+    read_columns,
+    read_header,
+)
+
+# =========================
+# CONFIGURATION
+# =========================
+
+LOG_DIR = Path("app/logs/phase2")
+
+_STAT_COLUMNS = ["timestamp", "kind", "symbol", "trade_allowed",
+                 "reason", "error", "latency_ms"]
+
+
+# =========================
+# QUERY
+# =========================
+
+def _file_day(path: Path) -> Optional[datetime]:
+    try:
+        return datetime.strptime(path.stem.split("_", 1)[1], "%Y-%m-%d")
+    except (IndexError, ValueError):
+        return None
+
+
+def _us(day: datetime) -> int:
+    return int(np.datetime64(day, "us").astype("int64"))
+
+
+def compute_stats(
+    log_dir: Path = LOG_DIR,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    symbol: Optional[str] = None,
+    top: int = 10,
+) -> Dict:
+    """
+    Decision / error rates, reason breakdown and latency stats over
+    [date_from, date_to] (whole days, inclusive).
+
+    Works one day file at a time: files outside the range are skipped by
+    name, files whose header range / symbol index do not match are
+    skipped without reading any column, and only the needed columns
+    are decompressed.
+    """
+
+    lo = _us(date_from) if date_from else None
+    hi = _us(date_to + timedelta(days=1)) if date_to else None
+
+    rows = decisions = errors = allowed = 0
+    reasons: Counter = Counter()
+    error_messages: Counter = Counter()
+    latencies = []
+    files = 0
+
+    for path in sorted(log_dir.glob("phase2_*.p2c")):
+        day = _file_day(path)
+        if day and date_from and day < date_from:
+            continue
+        if day and date_to and day > date_to:
+            continue
+
+        header = read_header(path)
+        if not header["rows"]:
+            continue
+        if lo is not None and header["ts_max"] < lo:
+            continue
+        if hi is not None and header["ts_min"] >= hi:
+            continue
+
+        files += 1
+        cols = read_columns(path, _STAT_COLUMNS, header)
+
+        # Rows are sorted by timestamp: the range is one slice
+        ts = cols["timestamp"]
+        start = np.searchsorted(ts, lo, "left") if lo is not None else 0
+        stop = np.searchsorted(ts, hi, "left") if hi is not None else len(ts)
+        mask = np.zeros(len(ts), dtype=bool)
+        mask[start:stop] = True
+
+        if symbol is not None:
+            symbols = header["columns"]["symbol"]["dict"]
+            if symbol in symbols:
+                # Error rows carry no symbol; keep them for the file's range
+                sym = cols["symbol"]
+                mask &= (sym == symbols.index(symbol)) | (sym == -1)
+            else:
+                mask &= cols["symbol"] == -1
+
+        kind = cols["kind"][mask]
+        is_decision = kind == KIND_DECISION
+
+        rows += int(mask.sum())
+        decisions += int(is_decision.sum())
+        errors += int((kind == KIND_ERROR).sum())
+        allowed += int((cols["trade_allowed"][mask] == 1).sum())
+
+        reason_values = header["columns"]["reason"]["dict"]
+        codes, counts = np.unique(cols["reason"][mask][is_decision], return_counts=True)
+        for code, count in zip(codes, counts):
+            reasons[reason_values[code] if code >= 0 else "TRADE_ALLOWED"] += int(count)
+
+        error_values = header["columns"]["error"]["dict"]
+        codes, counts = np.unique(cols["error"][mask][~is_decision], return_counts=True)
+        for code, count in zip(codes, counts):
+            if code >= 0:
+                error_messages[error_values[code]] += int(count)
+
+        latency = cols["latency_ms"][mask]
+        latencies.append(latency[~np.isnan(latency)])
+
+    latency = np.concatenate(latencies) if latencies else np.empty(0)
+
+    return {
+        "files": files,
+        "rows": rows,
+        "decisions": decisions,
+        "errors": errors,
+        "error_rate": errors / rows if rows else 0.0,
+        "trade_allowed": allowed,
+        "trade_allowed_rate": allowed / decisions if decisions else 0.0,
+        "reasons": dict(reasons.most_common(top)),
+        "top_errors": dict(error_messages.most_common(top)),
+        "latency_ms": {
+            "count": int(len(latency)),
+            "mean": float(latency.mean()) if len(latency) else None,
+            "p50": float(np.percentile(latency, 50)) if len(latency) else None,
+            "p95": float(np.percentile(latency, 95)) if len(latency) else None,
+            "p99": float(np.percentile(latency, 99)) if len(latency) else None,
+        },
+    }
+
+
+# =========================
+# ENTRY POINT
+# =========================
+
+def _date(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Phase 2 log analytics")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    conv = sub.add_parser("convert", help="convert phase2_*.jsonl to .p2c")
+    conv.add_argument("--dir", type=Path, default=LOG_DIR)
+    conv.add_argument("--out", type=Path, default=None)
+
+    stats = sub.add_parser("stats", help="rates, reasons and latency")
+    stats.add_argument("--dir", type=Path, default=LOG_DIR)
+    stats.add_argument("--from", dest="date_from", type=_date)
+    stats.add_argument("--to", dest="date_to", type=_date)
+    stats.add_argument("--symbol")
+    stats.add_argument("--top", type=int, default=10)
+
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        for path in convert_dir(args.dir, args.out):
+            print(f"✅ {path}")
+
+    else:
+        report = compute_stats(
+            log_dir=args.dir,
+            date_from=args.date_from,
+            date_to=args.date_to,
+            symbol=args.symbol,
+            top=args.top,
+        )
+
+        print(f"📁 {report['files']} files | {report['rows']} rows")
+        print(f"📊 decisions: {report['decisions']} | errors: {report['errors']} "
+              f"({report['error_rate']:.1%})")
+        print(f"✅ trade allowed: {report['trade_allowed']} "
+              f"({report['trade_allowed_rate']:.1%} of decisions)")
+
+        print("\nReasons:")
+        for reason, count in report["reasons"].items():
+            print(f"  {count:>6}  {reason}")
+
+        print("\nTop errors:")
+        for error, count in report["top_errors"].items():
+            print(f"  {count:>6}  {error[:100]}")
+
+        lat = report["latency_ms"]
+        if lat["count"]:
+            print(f"\n⏱ latency ms: mean {lat['mean']:.1f} | p50 {lat['p50']:.1f} | "
+                  f"p95 {lat['p95']:.1f} | p99 {lat['p99']:.1f} (n={lat['count']})")
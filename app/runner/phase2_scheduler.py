@@ -0,0 +1,65 @@
+import time
+from datetime import datetime
+
+from app.core.scheduler import EvaluationScheduler
+from app.runner.phase2_logger import compact_previous_days, log_entry
+
+# =========================
+# CONFIGURATION
+# =========================
+
+WATCHLIST = ["EUR/USD", "GBP/USD", "USD/JPY"]
+INDEX_SYMBOL = "DXY"
+TIMEFRAMES = ["1h", "30m", "15m"]
+
+# Give the provider a moment to publish the bar that just closed
+PUBLISH_DELAY_SECONDS = 5
+
+
+# =========================
+# MAIN LOOP
+# =========================
+
+def run_scheduler():
+    print("🟢 Phase 2 scheduler started")
+    print(f"📊 Watchlist: {WATCHLIST} | TFs: {TIMEFRAMES}")
+    print("Press Ctrl+C to stop\n")
+
+    def on_decision(symbol: str, decision: dict):
+        log_entry({
+            "timestamp": datetime.utcnow().isoformat(),
+            "symbol": symbol,
+            "timeframes": TIMEFRAMES,
+            **decision,
+        })
+
+    scheduler = EvaluationScheduler(
+        watchlist=WATCHLIST,
+        index_symbol=INDEX_SYMBOL,
+        timeframes=TIMEFRAMES,
+        on_decision=on_decision,
+    )
+
+    while True:
+        compact_previous_days()
+
+        report = scheduler.run_cycle()
+        timestamp = datetime.utcnow().isoformat()
+        print(f"[{timestamp}] {report.summary()}")
+
+        for key, error in report.failed.items():
+            print(f"[{timestamp}] ❌ {key}: {error}")
+
+        if report.pending_timeframes:
+            # Closed bar not published yet: retry those timeframes soon
+            time.sleep(PUBLISH_DELAY_SECONDS)
+        else:
+            time.sleep(scheduler.seconds_until_next_close() + PUBLISH_DELAY_SECONDS)
+
+
+# =========================
+# ENTRY POINT
+# =========================
+
+if __name__ == "__main__":
+    run_scheduler()
@@ -0,0 +1,225 @@
+import json
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+# =========================
+# Columnar phase 2 log (.p2c)
+# =========================
+#
+#   b"P2C1" | uint32 header length | JSON header | zlib column blobs
+#
+# One file per day, rows sorted by timestamp. Every row — decision or
+# error — has the same schema; string columns are dictionary-encoded
+# (int32 codes, -1 = null) with the dictionary kept in the header.
+# The header also carries the timestamp range and a per-symbol index
+# (rows, first/last timestamp), so queries can skip whole files and
+# read only the columns they need.
+
+MAGIC = b"P2C1"
+VERSION = 1
+
+KIND_DECISION = 0
+KIND_ERROR = 1
+
+SCHEMA = [
+    ("timestamp", "<i8"),       # epoch microseconds, UTC
+    ("kind", "u1"),             # KIND_DECISION | KIND_ERROR
+    ("symbol", "<i4"),          # dict code
+    ("trade_allowed", "i1"),    # -1 null, 0 false, 1 true
+    ("direction", "<i4"),       # dict code
+    ("reason", "<i4"),          # dict code
+    ("error", "<i4"),           # dict code
+    ("latency_ms", "<f4"),      # NaN when not recorded
+    ("extra", "<i4"),           # dict code of remaining fields as JSON
+]
+
+DICT_COLUMNS = {"symbol", "direction", "reason", "error", "extra"}
+
+_KNOWN_FIELDS = {
+    "timestamp", "symbol", "trade_allowed", "direction",
+    "reason", "error", "latency_ms",
+}
+
+
+# =========================
+# HELPERS
+# =========================
+
+class _Dictionary:
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def code(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+
+        return code
+
+
+def _timestamp_us(value: str) -> int:
+    return int(np.datetime64(value, "us").astype("int64"))
+
+
+def _timestamp_iso(value: int) -> str:
+    return str(np.datetime64(int(value), "us"))
+
+
+# =========================
+# WRITE
+# =========================
+
+def write_rows(path: Path, entries: Iterable[Dict]) -> Dict:
+    """
+    Encode phase 2 log entries (as written by phase2_logger) into one
+    columnar file. Returns the header.
+    """
+
+    entries = sorted(entries, key=lambda e: e["timestamp"])
+    dicts = {name: _Dictionary() for name in DICT_COLUMNS}
+    columns = {name: [] for name, _ in SCHEMA}
+
+    for entry in entries:
+        is_error = "error" in entry
+        allowed = entry.get("trade_allowed")
+        latency = entry.get("latency_ms")
+        extra = {k: v for k, v in entry.items() if k not in _KNOWN_FIELDS}
+
+        columns["timestamp"].append(_timestamp_us(entry["timestamp"]))
+        columns["kind"].append(KIND_ERROR if is_error else KIND_DECISION)
+        columns["symbol"].append(dicts["symbol"].code(entry.get("symbol")))
+        columns["trade_allowed"].append(-1 if allowed is None else int(allowed))
+        columns["direction"].append(dicts["direction"].code(entry.get("direction")))
+        columns["reason"].append(dicts["reason"].code(entry.get("reason")))
+        columns["error"].append(dicts["error"].code(entry.get("error")))
+        columns["latency_ms"].append(np.nan if latency is None else latency)
+        columns["extra"].append(
+            dicts["extra"].code(json.dumps(extra, sort_keys=True) if extra else None)
+        )
+
+    arrays = {
+        name: np.asarray(columns[name], dtype=dtype) for name, dtype in SCHEMA
+    }
+    blobs = {name: zlib.compress(arrays[name].tobytes(), 6) for name, _ in SCHEMA}
+
+    ts = arrays["timestamp"]
+    symbol_index = {}
+    for code, symbol in enumerate(dicts["symbol"].values):
+        rows = ts[arrays["symbol"] == code]
+        symbol_index[symbol] = {
+            "rows": int(len(rows)),
+            "ts_min": int(rows.min()),
+            "ts_max": int(rows.max()),
+        }
+
+    header = {
+        "version": VERSION,
+        "rows": len(entries),
+        "ts_min": int(ts.min()) if len(ts) else None,
+        "ts_max": int(ts.max()) if len(ts) else None,
+        "symbols": symbol_index,
+        "columns": {},
+    }
+
+    offset = 0
+    for name, dtype in SCHEMA:
+        header["columns"][name] = {
+            "dtype": dtype,
+            "offset": offset,
+            "length": len(blobs[name]),
+        }
+        if name in DICT_COLUMNS:
+            header["columns"][name]["dict"] = dicts[name].values
+        offset += len(blobs[name])
+
+    raw_header = json.dumps(header).encode()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+
+    with tmp.open("wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(raw_header)))
+        f.write(raw_header)
+        for name, _ in SCHEMA:
+            f.write(blobs[name])
+
+    tmp.replace(path)
+    return header
+
+
+def read_jsonl(path: Path) -> List[Dict]:
+    entries = []
+    with path.open() as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entries.append(json.loads(line))
+    return entries
+
+
+def convert_jsonl(src: Path, dst: Optional[Path] = None) -> Path:
+    """
+    phase2_YYYY-MM-DD.jsonl → phase2_YYYY-MM-DD.p2c (next to it by default).
+    """
+    dst = dst or src.with_suffix(".p2c")
+    write_rows(dst, read_jsonl(src))
+    return dst
+
+
+def convert_dir(src_dir: Path, dst_dir: Optional[Path] = None) -> List[Path]:
+    dst_dir = dst_dir or src_dir
+    return [
+        convert_jsonl(src, dst_dir / src.with_suffix(".p2c").name)
+        for src in sorted(src_dir.glob("phase2_*.jsonl"))
+    ]
+
+
+# =========================
+# READ
+# =========================
+
+def read_header(path: Path) -> Dict:
+    with path.open("rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a phase 2 columnar log: {path}")
+
+        (length,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(length))
+        header["data_start"] = len(MAGIC) + 4 + length
+
+    return header
+
+
+def read_columns(
+    path: Path,
+    names: List[str],
+    header: Optional[Dict] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Decode ONLY the requested columns (others are never read from disk).
+    """
+    header = header or read_header(path)
+    out = {}
+
+    with path.open("rb") as f:
+        for name in names:
+            spec = header["columns"][name]
+            f.seek(header["data_start"] + spec["offset"])
+            raw = zlib.decompress(f.read(spec["length"]))
+            out[name] = np.frombuffer(raw, dtype=spec["dtype"])
+
+    return out
+
+
+def decode(header: Dict, name: str, codes: np.ndarray) -> List[Optional[str]]:
+    values = header["columns"][name]["dict"]
+    return [values[c] if c >= 0 else None for c in codes]
@@ -0,0 +1,104 @@
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from app.core.replay_provider import ReplayStore
+
+# =========================
+# Local Twelve Data stub
+# =========================
+#
+# Serves recorded payloads on /time_series so the API can run with
+#   TWELVE_DATA_BASE_URL=http://127.0.0.1:8765
+# and no API key or network access.
+
+
+def make_handler(store: ReplayStore):
+    class ReplayHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+
+            if url.path.rstrip("/") != "/time_series":
+                self._send(404, {"status": "error", "message": "not found"})
+                return
+
+            query = parse_qs(url.query)
+            instrument = query.get("symbol", [""])[0]
+            granularity = query.get("interval", [""])[0]
+            count = int(query.get("outputsize", ["300"])[0])
+
+            if store.should_fail():
+                self._send(503, {"status": "error", "message": "injected error"})
+                return
+
+            try:
+                payload = store.payload(instrument, granularity, count)
+            except FileNotFoundError as e:
+                self._send(404, {"status": "error", "message": str(e)})
+                return
+
+            self._send(200, payload)
+
+        def _send(self, status: int, body: dict):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass  # keep load tests quiet
+
+    return ReplayHandler
+
+
+def serve_replay(
+    directory: str,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    latency_ms: float = 0.0,
+    error_rate: float = 0.0,
+    seed: int = 0,
+) -> ThreadingHTTPServer:
+    """
+    Build (but do not start) the stub server; call serve_forever() on it.
+    """
+    store = ReplayStore(
+        directory=directory,
+        latency_ms=latency_ms,
+        error_rate=error_rate,
+        seed=seed,
+    )
+    return ThreadingHTTPServer((host, port), make_handler(store))
+
+
+# =========================
+# ENTRY POINT
+# =========================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Twelve Data replay stub")
+    parser.add_argument("--dir", default="app/recordings")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = serve_replay(
+        directory=args.dir,
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+
+    print(f"🟢 Replay stub on http://{args.host}:{args.port} (dir={args.dir})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
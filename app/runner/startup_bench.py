@@ -0,0 +1,118 @@
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import requests
+
+# =========================
+# CONFIGURATION
+# =========================
+
+APP = "app.main:app"
+HEAVY_MODULES = ["pandas", "numpy", "ccxt", "requests", "sqlite3"]
+
+_IMPORT_PROBE = (
+    "import sys, time\n"
+    "t = time.perf_counter()\n"
+    "import app.main\n"
+    "print(time.perf_counter() - t)\n"
+    "print(','.join(m for m in {heavy!r} if m in sys.modules))\n"
+)
+
+
+# =========================
+# HELPERS
+# =========================
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_import(runs: int = 5) -> Dict:
+    """
+    Import app.main in fresh interpreters; report median seconds and
+    which heavy modules were pulled in at import time.
+    """
+    times: List[float] = []
+    loaded = ""
+
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _IMPORT_PROBE.format(heavy=HEAVY_MODULES)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.splitlines()
+
+        times.append(float(out[0]))
+        loaded = out[1] if len(out) > 1 else ""
+
+    return {
+        "import_median_s": round(statistics.median(times), 4),
+        "import_min_s": round(min(times), 4),
+        "heavy_loaded_at_import": loaded.split(",") if loaded else [],
+    }
+
+
+def measure_first_response(path: str = "/", timeout: float = 60.0) -> Dict:
+    """
+    Launch uvicorn and poll `path` until it answers; report seconds
+    from process spawn to first successful response.
+    """
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}{path}"
+
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", APP, "--port", str(port),
+         "--log-level", "warning"],
+        env={**os.environ},
+    )
+
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                response = requests.get(url, timeout=timeout)
+                if response.status_code < 500:
+                    return {
+                        "path": path,
+                        "first_response_s": round(time.perf_counter() - started, 4),
+                        "status": response.status_code,
+                    }
+            except requests.ConnectionError:
+                time.sleep(0.01)
+
+        return {"path": path, "first_response_s": None, "status": None}
+
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+# =========================
+# ENTRY POINT
+# =========================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", action="append", dest="paths",
+                        help="endpoint(s) to time, default: /")
+    args = parser.parse_args()
+
+    imports = measure_import(args.runs)
+    print(f"📦 import app.main: {imports['import_median_s']}s median "
+          f"({imports['import_min_s']}s min) over {args.runs} runs")
+    print(f"   heavy modules at import: {imports['heavy_loaded_at_import'] or 'none'}")
+
+    for path in args.paths or ["/"]:
+        result = measure_first_response(path)
+        print(f"⏱ first response {result['path']}: "
+              f"{result['first_response_s']}s (status {result['status']})")
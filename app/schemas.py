@@ -0,0 +1,71 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+from app.core.timeframes import TIMEFRAME_MAP
+
+
+# =========
+# Signal decision
+# =========
+
+class AlignmentDetails(BaseModel):
+    aligned: bool
+    direction: Optional[str]
+    valid_timeframes: List[str]
+    reason: Optional[str]
+
+
+class SignalZone(BaseModel):
+    lower: float
+    upper: float
+    timeframe: str
+
+
+class SignalResponse(BaseModel):
+    """
+    Phase 2C decision. Only the fields relevant to the outcome are
+    present; serialize with exclude_unset=True to keep that shape.
+    """
+    trade_allowed: bool
+    reason: Optional[str] = None
+    details: Optional[AlignmentDetails] = None
+    direction: Optional[str] = None
+    zone: Optional[SignalZone] = None
+    entry_index: Optional[int] = None
+    note: Optional[str] = None
+
+
+# =========
+# Batch evaluation
+# =========
+
+class BatchJobRequest(BaseModel):
+    symbol: str
+    index_symbol: Optional[str] = None
+    timeframes: Optional[List[str]] = None
+    params: Optional[Dict] = None
+    as_of: Optional[str] = None
+    job_id: Optional[str] = None
+
+    @field_validator("timeframes")
+    @classmethod
+    def known_timeframes(cls, timeframes: Optional[List[str]]) -> Optional[List[str]]:
+        if timeframes is None:
+            return None
+        if not timeframes:
+            raise ValueError("timeframes must not be empty")
+
+        unknown = [tf for tf in timeframes if tf not in TIMEFRAME_MAP]
+        if unknown:
+            raise ValueError(
+                f"Unknown timeframes {unknown}; supported: {list(TIMEFRAME_MAP)}"
+            )
+        return timeframes
+
+
+class BatchRequest(BaseModel):
+    jobs: List[BatchJobRequest] = Field(..., min_length=1)
+    max_workers: Optional[int] = Field(None, ge=1)
+    # Bars fetched per series; raise it for jobs with an older as_of
+    history: int = Field(300, ge=1, le=5000)
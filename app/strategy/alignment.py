@@ -4,9 +4,11 @@ from app.strategy.structure import StructureResult
 
 def evaluate_alignment(
     structure_results: Dict[str, StructureResult],
+    min_aligned: int = 2,
 ) -> Dict:
     """
-    Apply 2-of-3 timeframe alignment rule.
+    Apply 2-of-3 timeframe alignment rule
+    (`min_aligned` timeframes must agree).
 
     Returns:
         {
@@ -30,7 +32,7 @@ def evaluate_alignment(
         elif result.direction == "bearish":
             bearish_tfs.append(tf)
 
-    if len(bullish_tfs) >= 2:
+    if len(bullish_tfs) >= min_aligned:
         return {
             "aligned": True,
             "direction": "bullish",
@@ -38,7 +40,7 @@ def evaluate_alignment(
             "reason": None,
         }
 
-    if len(bearish_tfs) >= 2:
+    if len(bearish_tfs) >= min_aligned:
         return {
             "aligned": True,
             "direction": "bearish",
@@ -50,5 +52,5 @@ def evaluate_alignment(
         "aligned": False,
         "direction": None,
         "valid_timeframes": [],
-        "reason": "Less than 2 timeframes aligned",
+        "reason": f"Less than {min_aligned} timeframes aligned",
     }
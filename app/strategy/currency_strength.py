@@ -0,0 +1,162 @@
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Market-convention priority: the higher-ranked currency is the base
+CURRENCIES = ["EUR", "GBP", "AUD", "NZD", "USD", "CAD", "CHF", "JPY"]
+
+# All 28 crosses of the 8 majors, e.g. "EUR/USD", "GBP/JPY"
+MAJOR_CROSSES = [f"{base}/{quote}" for base, quote in combinations(CURRENCIES, 2)]
+
+
+def split_pair(symbol: str) -> Tuple[str, str]:
+    """
+    "EUR/GBP" or "EURGBP" → ("EUR", "GBP")
+    """
+    symbol = symbol.replace("/", "")
+    return symbol[:3], symbol[3:6]
+
+
+# =========
+# Design matrix
+# =========
+
+def design_matrix(
+    pairs: List[str],
+    currencies: Optional[List[str]] = None,
+) -> np.ndarray:
+    """
+    A[p, c] = +1 if c is the base of pair p, -1 if it is the quote.
+    A pair's log return is modelled as strength[base] - strength[quote].
+    """
+    currencies = currencies or CURRENCIES
+    column = {c: i for i, c in enumerate(currencies)}
+    A = np.zeros((len(pairs), len(currencies)))
+
+    for p, symbol in enumerate(pairs):
+        base, quote = split_pair(symbol)
+        A[p, column[base]] = 1.0
+        A[p, column[quote]] = -1.0
+
+    return A
+
+
+# =========
+# Strength engine
+# =========
+
+def solve_strength(
+    returns: np.ndarray,
+    pairs: List[str],
+    currencies: Optional[List[str]] = None,
+) -> np.ndarray:
+    """
+    Per-currency strength from a (T × P) matrix of pair log returns,
+    for all T rows in ONE least-squares solve.
+
+    Strength is only defined up to a common offset; the pseudo-inverse
+    picks the zero-sum solution, so values are relative to the basket.
+    With all 28 crosses this reduces to the mean signed return of each
+    currency's pairs. Returns a (T × C) matrix.
+    """
+    A = design_matrix(pairs, currencies)
+    return returns @ np.linalg.pinv(A).T
+
+
+def strength_from_closes(
+    closes: pd.DataFrame,
+    currencies: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    closes: time-aligned close prices, one column per pair.
+    Returns cumulative strength per currency (index aligned to closes,
+    first row dropped). Rows with any missing close are skipped.
+    """
+    currencies = currencies or CURRENCIES
+    closes = closes.dropna()
+
+    log_returns = np.diff(np.log(closes.to_numpy(dtype="float64")), axis=0)
+    strength = solve_strength(log_returns, list(closes.columns), currencies)
+
+    return pd.DataFrame(
+        np.cumsum(strength, axis=0),
+        index=closes.index[1:],
+        columns=currencies,
+    )
+
+
+def strength_bias(
+    strength: pd.DataFrame,
+    lookback: int = 20,
+) -> Dict[str, Optional[str]]:
+    """
+    Direction of each currency's strength over the last `lookback` bars:
+    "bullish" (strengthening), "bearish" (weakening) or None.
+    """
+    if len(strength) < 2:
+        return {c: None for c in strength.columns}
+
+    window = strength.iloc[-(lookback + 1):]
+    change = window.iloc[-1] - window.iloc[0]
+
+    return {
+        c: "bullish" if change[c] > 0 else "bearish" if change[c] < 0 else None
+        for c in strength.columns
+    }
+
+
+# =========
+# Index confirmation for ANY pair
+# =========
+
+def strength_confirms_pair(
+    symbol: str,
+    pair_alignment: Dict,
+    strength: pd.DataFrame,
+    lookback: int = 20,
+) -> Dict:
+    """
+    Index filter equivalent for any pair (incl. crosses like EUR/GBP),
+    applied to each leg on its own, the way DXY confirms the USD leg:
+    a bullish pair needs the base strengthening AND the quote weakening
+    against the basket over `lookback` bars, a bearish pair the opposite.
+
+    Comparing base - quote instead would only restate the pair's own
+    return (with consistent cross rates the two are identical).
+    """
+
+    if not pair_alignment["aligned"]:
+        return {
+            "allowed": False,
+            "reason": "Pair structure not aligned",
+        }
+
+    base, quote = split_pair(symbol)
+
+    if base not in strength.columns or quote not in strength.columns:
+        return {
+            "allowed": False,
+            "reason": f"No currency strength for {symbol}",
+        }
+
+    direction = pair_alignment["direction"]
+    opposite = {"bullish": "bearish", "bearish": "bullish"}.get(direction)
+    bias = strength_bias(strength[[base, quote]], lookback=lookback)
+
+    if bias[base] != direction or bias[quote] != opposite:
+        return {
+            "allowed": False,
+            "reason": (
+                f"Currency strength contradicts pair "
+                f"(expected {base} {direction} / {quote} {opposite}, "
+                f"got {base} {bias[base]} / {quote} {bias[quote]})"
+            ),
+        }
+
+    return {
+        "allowed": True,
+        "reason": None,
+    }
@@ -171,14 +171,18 @@ def evaluate_structure(
     df: pd.DataFrame,
     timeframe: str,
     failure_validator: callable,
+    swing_lookback: int = 3,
 ) -> StructureResult:
     """
     Evaluate full structure on ONE timeframe.
+
+    Read-only on `df`, which may be a zero-copy view of a live candle
+    buffer (MarketDataService.read_ohlcv); keeps no reference to it.
     """
 
     closes = df["close"]
 
-    swings = detect_swings(closes)
+    swings = detect_swings(closes, lookback=swing_lookback)
     bos = detect_bos(closes, swings)
 
     if not bos:
@@ -0,0 +1,428 @@
+import heapq
+import itertools
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from app.strategy.structure import StructureResult, StructureZone
+
+
+ZONE_CREATED = "created"
+ZONE_RETESTED = "retested"
+ZONE_INVALIDATED = "invalidated"
+
+# Zones with no lifecycle event (created / retest / invalidation) for
+# this long in bar time are dropped, active or not
+DEFAULT_ZONE_MAX_AGE = 14 * 24 * 60 * 60     # seconds
+
+_NS = 1_000_000_000
+
+
+# =========
+# Data Models
+# =========
+
+@dataclass
+class ZoneRecord:
+    zone_id: int
+    symbol: str
+    zone: StructureZone
+    state: str = ZONE_CREATED
+    created_at: Optional[int] = None        # bar timestamp (epoch ns)
+    last_retest_at: Optional[int] = None
+    invalidated_at: Optional[int] = None
+    retests: int = 0
+
+    @property
+    def timeframe(self) -> str:
+        return self.zone.timeframe
+
+    @property
+    def direction(self) -> str:
+        return self.zone.direction
+
+    @property
+    def lower(self) -> float:
+        return self.zone.lower
+
+    @property
+    def upper(self) -> float:
+        return self.zone.upper
+
+    @property
+    def last_event_at(self) -> Optional[int]:
+        events = [t for t in (self.created_at, self.last_retest_at, self.invalidated_at)
+                  if t is not None]
+        return max(events, default=None)
+
+
+# =========
+# Centered interval tree (static, rebuilt on change)
+# =========
+
+class _Node:
+    __slots__ = ("center", "by_lower", "lowers", "by_upper", "neg_uppers", "left", "right")
+
+
+class IntervalTree:
+    """
+    Overlap queries over [lower, upper] intervals in O(log n + k).
+
+    The center of each node is the median endpoint, so depth stays
+    O(log n). Each node keeps the intervals containing its center twice:
+    sorted by lower (asc) and by upper (desc), for bisect cut-offs.
+    """
+
+    def __init__(self, records: List[ZoneRecord]):
+        self.size = len(records)
+        self._root = self._build(records)
+
+    def _build(self, records: List[ZoneRecord]) -> Optional[_Node]:
+        if not records:
+            return None
+
+        points = sorted(p for r in records for p in (r.lower, r.upper))
+        center = points[len(points) // 2]
+
+        left = [r for r in records if r.upper < center]
+        right = [r for r in records if r.lower > center]
+        here = [r for r in records if r.lower <= center <= r.upper]
+
+        node = _Node()
+        node.center = center
+        node.by_lower = sorted(here, key=lambda r: r.lower)
+        node.lowers = [r.lower for r in node.by_lower]
+        node.by_upper = sorted(here, key=lambda r: -r.upper)
+        node.neg_uppers = [-r.upper for r in node.by_upper]
+        node.left = self._build(left)
+        node.right = self._build(right)
+
+        return node
+
+    def overlapping(self, low: float, high: float) -> List[ZoneRecord]:
+        """
+        Every interval with lower <= high and upper >= low.
+        """
+        out: List[ZoneRecord] = []
+        stack = [self._root]
+
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+
+            if high < node.center:
+                # All intervals here reach the center, i.e. above `high`
+                out.extend(node.by_lower[:bisect_right(node.lowers, high)])
+                stack.append(node.left)
+
+            elif low > node.center:
+                out.extend(node.by_upper[:bisect_right(node.neg_uppers, -low)])
+                stack.append(node.right)
+
+            else:
+                out.extend(node.by_lower)
+                stack.append(node.left)
+                stack.append(node.right)
+
+        return out
+
+
+# =========
+# Zone index
+# =========
+
+class ZoneIndex:
+    """
+    Persistent index of structure zones per symbol, with lifecycle:
+
+        created → retested (price trades into the zone)
+        created / retested → invalidated (close beyond the far edge)
+
+    Only active zones live in the per-symbol interval tree; trees are
+    rebuilt lazily on the first query after a change.
+    Re-adding a known zone (same symbol / timeframe / direction / edges)
+    returns the existing record, so callers can register every
+    evaluation's zones without duplicates.
+
+    Records expire: once a symbol's bars are `max_age` seconds past a
+    zone's last lifecycle event, the zone is forgotten (records without
+    any timestamp never expire). None disables expiry. A per-symbol
+    min-heap of (last_event_at, zone_id) keeps expiry proportional to
+    the zones actually dropped; entries superseded by a later event are
+    skipped when they surface.
+    """
+
+    def __init__(self, max_age: Optional[float] = DEFAULT_ZONE_MAX_AGE):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._ids = itertools.count(1)
+        self._records: Dict[int, ZoneRecord] = {}
+        self._keys: Dict[Tuple, int] = {}
+        self._by_symbol: Dict[str, Dict[int, ZoneRecord]] = {}
+        self._active: Dict[str, Dict[int, ZoneRecord]] = {}
+        self._trees: Dict[str, IntervalTree] = {}
+        self._expiry: Dict[str, List[Tuple[int, int]]] = {}
+
+    @staticmethod
+    def _key(symbol: str, zone: StructureZone) -> Tuple:
+        return (symbol, zone.timeframe, zone.direction, zone.lower, zone.upper)
+
+    def _touch(self, record: ZoneRecord):
+        """
+        Queue the record's latest lifecycle event for expiry.
+        """
+        if record.last_event_at is not None:
+            heapq.heappush(
+                self._expiry.setdefault(record.symbol, []),
+                (record.last_event_at, record.zone_id),
+            )
+
+    # ---------
+    # Registration
+    # ---------
+
+    def add(
+        self,
+        symbol: str,
+        zone: StructureZone,
+        timestamp: Optional[int] = None,
+    ) -> ZoneRecord:
+        key = self._key(symbol, zone)
+
+        with self._lock:
+            zone_id = self._keys.get(key)
+            if zone_id is not None:
+                return self._records[zone_id]
+
+            record = ZoneRecord(
+                zone_id=next(self._ids),
+                symbol=symbol,
+                zone=zone,
+                created_at=timestamp,
+            )
+            self._records[record.zone_id] = record
+            self._keys[key] = record.zone_id
+            self._by_symbol.setdefault(symbol, {})[record.zone_id] = record
+            self._active.setdefault(symbol, {})[record.zone_id] = record
+            self._trees.pop(symbol, None)
+            self._touch(record)
+
+        return record
+
+    def add_structures(
+        self,
+        symbol: str,
+        structures: Dict[str, StructureResult],
+        timestamp: Optional[int] = None,
+    ) -> List[ZoneRecord]:
+        return [
+            self.add(symbol, result.zone, timestamp)
+            for result in structures.values()
+            if result.valid and result.zone
+        ]
+
+    # ---------
+    # Queries
+    # ---------
+
+    def _tree(self, symbol: str) -> IntervalTree:
+        tree = self._trees.get(symbol)
+
+        if tree is None:
+            tree = IntervalTree(list(self._active.get(symbol, {}).values()))
+            self._trees[symbol] = tree
+
+        return tree
+
+    def penetrated(
+        self,
+        symbol: str,
+        low: float,
+        high: float,
+        timeframe: Optional[str] = None,
+        direction: Optional[str] = None,
+    ) -> List[ZoneRecord]:
+        """
+        Active zones that the range [low, high] trades into.
+        """
+        with self._lock:
+            hits = self._tree(symbol).overlapping(low, high)
+
+        return [
+            r for r in hits
+            if (timeframe is None or r.timeframe == timeframe)
+            and (direction is None or r.direction == direction)
+        ]
+
+    def at_price(self, symbol: str, price: float) -> List[ZoneRecord]:
+        return self.penetrated(symbol, price, price)
+
+    def penetrated_all(
+        self,
+        ranges: Dict[str, Tuple[float, float]],
+    ) -> Dict[str, List[ZoneRecord]]:
+        """
+        Watchlist-wide query: {symbol: (low, high)} → {symbol: zones}.
+        """
+        return {
+            symbol: hits
+            for symbol, (low, high) in ranges.items()
+            if (hits := self.penetrated(symbol, low, high))
+        }
+
+    def active(
+        self,
+        symbol: str,
+        timeframe: Optional[str] = None,
+    ) -> List[ZoneRecord]:
+        with self._lock:
+            records = list(self._active.get(symbol, {}).values())
+
+        return [r for r in records if timeframe is None or r.timeframe == timeframe]
+
+    def get(self, zone_id: int) -> Optional[ZoneRecord]:
+        return self._records.get(zone_id)
+
+    def records(self) -> List[ZoneRecord]:
+        with self._lock:
+            return list(self._records.values())
+
+    # ---------
+    # Lifecycle
+    # ---------
+
+    def on_bar(
+        self,
+        symbol: str,
+        high: float,
+        low: float,
+        close: float,
+        timestamp: Optional[int] = None,
+        timeframe: Optional[str] = None,
+        closed: bool = True,
+    ) -> List[ZoneRecord]:
+        """
+        Apply one candle to the symbol's active zones.
+        Returns the records whose state changed or were retested again.
+
+        Only a closed bar (closed=True) whose close is beyond the far edge
+        invalidates; a forming bar may be applied repeatedly and only
+        retests, since an intrabar wick can still come back. A retest is
+        counted once per bar (timestamp). With a timestamp, expired zones
+        of the symbol are dropped afterwards.
+        """
+        changed: List[ZoneRecord] = []
+
+        with self._lock:
+            for record in self.penetrated(symbol, low, high, timeframe=timeframe):
+                if closed and (
+                    (record.direction == "bullish" and close < record.lower)
+                    or (record.direction == "bearish" and close > record.upper)
+                ):
+                    self._invalidate(record, timestamp)
+
+                elif timestamp is not None and record.last_retest_at == timestamp:
+                    continue
+
+                else:
+                    record.state = ZONE_RETESTED
+                    record.retests += 1
+                    record.last_retest_at = timestamp
+                    self._touch(record)
+
+                changed.append(record)
+
+            if timestamp is not None:
+                self.expire(symbol, timestamp)
+
+        return changed
+
+    def expire(self, symbol: str, now: int) -> List[ZoneRecord]:
+        """
+        Drop the symbol's zones whose last lifecycle event is more than
+        `max_age` before `now` (epoch ns). Returns the dropped records.
+        """
+        if self.max_age is None:
+            return []
+
+        cutoff = now - int(self.max_age * _NS)
+        expired: List[ZoneRecord] = []
+
+        with self._lock:
+            heap = self._expiry.get(symbol, [])
+            by_symbol = self._by_symbol.get(symbol, {})
+
+            while heap and heap[0][0] < cutoff:
+                event_at, zone_id = heapq.heappop(heap)
+                record = by_symbol.get(zone_id)
+
+                # Gone already, or touched again since this entry
+                if record is None or record.last_event_at != event_at:
+                    continue
+
+                expired.append(record)
+                self._records.pop(zone_id, None)
+                self._keys.pop(self._key(record.symbol, record.zone), None)
+                by_symbol.pop(zone_id, None)
+                if self._active.get(symbol, {}).pop(zone_id, None) is not None:
+                    self._trees.pop(symbol, None)
+
+        return expired
+
+    def _invalidate(self, record: ZoneRecord, timestamp: Optional[int]):
+        record.state = ZONE_INVALIDATED
+        record.invalidated_at = timestamp
+        self._active.get(record.symbol, {}).pop(record.zone_id, None)
+        self._trees.pop(record.symbol, None)
+        self._touch(record)
+
+    def load_records(self, records: List[ZoneRecord]):
+        """
+        Restore records (e.g. from state snapshots), keeping their ids
+        and lifecycle state. Loading several snapshots merges them: a
+        known zone (same key) is replaced by the later copy under its
+        existing id, and an id already taken by another zone is
+        reassigned. New zones get ids after the largest one.
+        """
+        with self._lock:
+            next_id = max([*self._records, *(r.zone_id for r in records)], default=0) + 1
+
+            for record in records:
+                key = self._key(record.symbol, record.zone)
+                known = self._keys.get(key)
+
+                if known is not None:
+                    record.zone_id = known
+                elif record.zone_id in self._records:
+                    record.zone_id = next_id
+                    next_id += 1
+
+                self._records[record.zone_id] = record
+                self._keys[key] = record.zone_id
+                self._by_symbol.setdefault(record.symbol, {})[record.zone_id] = record
+
+                active = self._active.setdefault(record.symbol, {})
+                if record.state == ZONE_INVALIDATED:
+                    active.pop(record.zone_id, None)
+                else:
+                    active[record.zone_id] = record
+
+                self._touch(record)
+
+            self._trees.clear()
+            self._ids = itertools.count(next_id)
+
+    def invalidate(self, zone_id: int, timestamp: Optional[int] = None):
+        with self._lock:
+            record = self._records.get(zone_id)
+            if record is not None and record.state != ZONE_INVALIDATED:
+                self._invalidate(record, timestamp)
+
+
+_zone_index = ZoneIndex()
+
+
+def get_zone_index() -> ZoneIndex:
+    return _zone_index
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+
+from app.core.batch import BatchJob, parse_as_of, run_batch
+from app.core.market_data import MarketDataService
+from app.schemas import BatchJobRequest
+
+
+class _FrameProvider(MarketDataService):
+    """
+    Synthetic candles for every series; counts fetches.
+    """
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str, limit: int = 300) -> pd.DataFrame:
+        self.calls.append((symbol, timeframe))
+        if (symbol, timeframe) in self.failing:
+            raise RuntimeError("provider down")
+
+        index = pd.date_range("2024-01-01", periods=limit, freq="15min", name="timestamp")
+        closes = 1.0 + np.sin(np.arange(limit) / 5.0) / 100.0
+        return pd.DataFrame(
+            {"open": closes, "high": closes, "low": closes, "close": closes, "volume": 0.0},
+            index=index,
+        )
+
+
+def _run(jobs, market_data, history=100):
+    return {r["job_id"]: r for r in run_batch(jobs, max_workers=1, market_data=market_data, history=history)}
+
+
+# =========
+# Request validation
+# =========
+
+def test_unknown_timeframes_are_rejected():
+    with pytest.raises(ValidationError):
+        BatchJobRequest(symbol="EUR/USD", timeframes=["4h"])
+
+    with pytest.raises(ValidationError):
+        BatchJobRequest(symbol="EUR/USD", timeframes=[])
+
+    assert BatchJobRequest(symbol="EUR/USD", timeframes=["1h", "15m"]).timeframes == ["1h", "15m"]
+
+
+def test_as_of_offsets_become_naive_utc():
+    assert parse_as_of("2024-01-01T12:00:00+02:00") == pd.Timestamp("2024-01-01 10:00")
+    assert parse_as_of(None) is None
+
+
+# =========
+# Per-job errors
+# =========
+
+def test_bad_jobs_fail_alone():
+    market_data = _FrameProvider(failing={("GBP/USD", "15m")})
+    jobs = [
+        BatchJob("EUR/USD", timeframes=["15m"], job_id="ok"),
+        BatchJob("EUR/GBP", timeframes=[], job_id="no-timeframes"),
+        BatchJob("GBP/USD", timeframes=["15m"], job_id="no-candles"),
+        BatchJob("EUR/USD", timeframes=["15m"], as_of="2023-01-01", job_id="too-early"),
+    ]
+
+    results = _run(jobs, market_data)
+
+    assert set(results) == {"ok", "no-timeframes", "no-candles", "too-early"}
+    assert "decision" in results["ok"]
+    assert results["no-timeframes"]["error"].startswith("ValueError")
+    assert "Candles unavailable for GBP/USD 15m" in results["no-candles"]["error"]
+    assert "predates loaded" in results["too-early"]["error"]
+
+
+def test_each_series_is_fetched_once():
+    market_data = _FrameProvider()
+    jobs = [BatchJob("EUR/USD", timeframes=["15m"], job_id=str(i)) for i in range(3)]
+
+    _run(jobs, market_data)
+
+    assert sorted(market_data.calls) == [("DXY", "15m"), ("EUR/USD", "15m")]
@@ -0,0 +1,41 @@
+import json
+
+from app.core.replay_provider import (
+    RecordingForexDataProvider,
+    merge_values,
+    recording_path,
+)
+
+
+def _values(hours):
+    """
+    Twelve Data style values, newest first.
+    """
+    return [
+        {"datetime": f"2024-01-01 {h:02d}:00:00", "close": str(h)}
+        for h in sorted(hours, reverse=True)
+    ]
+
+
+def test_merge_keeps_history_and_prefers_fetched_values():
+    recorded = _values(range(10))
+    fetched = _values([11, 10]) + [{"datetime": "2024-01-01 09:00:00", "close": "final"}]
+
+    merged = merge_values(recorded, fetched)
+
+    assert [v["datetime"][11:13] for v in merged] == [f"{h:02d}" for h in range(11, -1, -1)]
+    assert merged[2]["close"] == "final"
+
+
+def test_short_delta_fetch_does_not_shrink_recording(tmp_path):
+    provider = RecordingForexDataProvider(str(tmp_path), api_key="test")
+    path = recording_path(str(tmp_path), "EUR/USD", "1h")
+
+    provider._record(path, {"meta": {"symbol": "EUR/USD"}, "values": _values(range(20))})
+    provider._record(path, {"meta": {"symbol": "EUR/USD"}, "values": _values([19, 20, 21])})
+
+    values = json.loads(path.read_text())["values"]
+
+    assert len(values) == 22
+    assert values[0]["datetime"] == "2024-01-01 21:00:00"
+    assert list(tmp_path.glob("*.tmp")) == []
@@ -0,0 +1,106 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.ring_buffer import OHLCV_COLUMNS, CandleRingBuffer
+
+
+MINUTE_NS = 60 * 1_000_000_000
+
+
+def _frame(start: int, rows: int) -> pd.DataFrame:
+    index = pd.date_range(
+        pd.Timestamp("2024-01-01") + pd.Timedelta(minutes=start),
+        periods=rows, freq="1min", name="timestamp", unit="ns",
+    )
+    closes = [float(start + i) for i in range(rows)]
+    return pd.DataFrame({name: closes for name in OHLCV_COLUMNS}, index=index)
+
+
+# =========
+# Writes
+# =========
+
+def test_wrap_keeps_newest_bars_in_order():
+    buffer = CandleRingBuffer(capacity=5)
+    buffer.ingest(_frame(0, 3))
+    buffer.ingest(_frame(3, 4))     # wraps past the end
+
+    df = buffer.frame()
+
+    assert len(buffer) == 5
+    assert df["close"].tolist() == [2.0, 3.0, 4.0, 5.0, 6.0]
+    assert df.index.is_monotonic_increasing
+    assert buffer.frame(2)["close"].tolist() == [5.0, 6.0]
+
+
+def test_merge_replaces_newest_and_ignores_older_bars():
+    buffer = CandleRingBuffer(capacity=10)
+    buffer.ingest(_frame(0, 4))
+
+    revised = _frame(2, 3)          # overlaps 2-3, adds 4
+    revised.loc[revised.index[1], "close"] = 99.0   # bar 3 closed differently
+    revised.loc[revised.index[0], "close"] = -1.0   # bar 2 is older: ignored
+    buffer.ingest(revised)
+
+    assert buffer.frame()["close"].tolist() == [0.0, 1.0, 2.0, 99.0, 4.0]
+
+
+def test_upsert_appends_replaces_or_ignores():
+    buffer = CandleRingBuffer(capacity=3)
+    t0 = pd.Timestamp("2024-01-01").value
+
+    assert buffer.upsert(t0, 1, 1, 1, 1)
+    assert buffer.upsert(t0 + MINUTE_NS, 2, 2, 2, 2)
+    assert buffer.upsert(t0 + MINUTE_NS, 3, 3, 3, 3)
+    assert not buffer.upsert(t0, 9, 9, 9, 9)
+
+    assert buffer.frame()["close"].tolist() == [1.0, 3.0]
+
+
+# =========
+# Reads
+# =========
+
+def test_frame_is_a_copy():
+    buffer = CandleRingBuffer(capacity=5)
+    buffer.ingest(_frame(0, 3))
+
+    df = buffer.frame()
+    buffer.update_last(9, 9, 9, 9)
+
+    assert df["close"].iloc[-1] == 2.0
+
+
+def test_reading_is_zero_copy_and_read_only():
+    buffer = CandleRingBuffer(capacity=5)
+    buffer.ingest(_frame(0, 7))
+
+    with buffer.reading(3) as df:
+        closes = df["close"].to_numpy()
+        assert np.shares_memory(closes, buffer.view()["close"])
+        assert closes.tolist() == [4.0, 5.0, 6.0]
+
+        with pytest.raises(ValueError):
+            closes[0] = 0.0
+
+
+def test_writes_wait_for_reading_block():
+    buffer = CandleRingBuffer(capacity=5)
+    buffer.ingest(_frame(0, 3))
+    wrote = threading.Event()
+
+    def write():
+        buffer.update_last(9, 9, 9, 9)
+        wrote.set()
+
+    with buffer.reading() as df:
+        t = threading.Thread(target=write)
+        t.start()
+        assert not wrote.wait(0.1)
+        assert df["close"].iloc[-1] == 2.0
+
+    t.join()
+    assert buffer.frame()["close"].iloc[-1] == 9.0
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from app.core.market_data import MarketDataService
+from app.core.scheduler import EvaluationScheduler
+from app.core.timeframes import TIMEFRAME_SECONDS, last_closed_bar
+from app.strategy.zone_index import ZoneIndex
+
+
+NOW = 1_704_110_400.0 + 60     # 2024-01-01 12:01 UTC, 15m bar just closed
+
+
+class _LaggingProvider(MarketDataService):
+    """
+    Candles ending `lag` bars before the last closed one.
+    """
+
+    def __init__(self):
+        self.lag = 1
+        self.calls = 0
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str, limit: int = 300) -> pd.DataFrame:
+        self.calls += 1
+        seconds = TIMEFRAME_SECONDS[timeframe]
+        end = last_closed_bar(timeframe, NOW) - self.lag * seconds
+        index = pd.date_range(
+            end=pd.Timestamp(end, unit="s"), periods=100,
+            freq=f"{seconds}s", name="timestamp", unit="ns",
+        )
+        closes = 1.0 + np.arange(100) / 1000.0
+        return pd.DataFrame(
+            {"open": closes, "high": closes, "low": closes, "close": closes, "volume": 0.0},
+            index=index,
+        )
+
+
+def test_timeframe_stays_due_until_closed_bar_is_published():
+    provider = _LaggingProvider()
+    scheduler = EvaluationScheduler(
+        watchlist=["EUR/USD"],
+        timeframes=["15m"],
+        market_data=provider,
+        zone_index=ZoneIndex(),
+    )
+
+    report = scheduler.run_cycle(NOW)
+    assert report.pending_timeframes == ["15m"]
+    assert scheduler.due_timeframes(NOW + 5) == ["15m"]
+
+    provider.lag = 0
+    report = scheduler.run_cycle(NOW + 5)
+    assert report.pending_timeframes == []
+    assert scheduler.due_timeframes(NOW + 10) == []
@@ -0,0 +1,129 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from app.core.shared_cache import SharedCache
+
+
+def _frame(rows: int = 3) -> pd.DataFrame:
+    index = pd.date_range(
+        "2024-01-01", periods=rows, freq="15min", name="timestamp", unit="ns"
+    )
+    return pd.DataFrame(
+        {name: [float(i) for i in range(rows)]
+         for name in ["open", "high", "low", "close", "volume"]},
+        index=index,
+    )
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "cache.sqlite3")
+
+
+# =========
+# Refresh lease
+# =========
+
+def test_lease_is_exclusive_until_released(path):
+    a = SharedCache(path, lock_ttl=5.0)
+    results = {}
+
+    assert a.try_acquire("k")
+
+    # Another thread is another owner
+    t = threading.Thread(target=lambda: results.update(b=a.try_acquire("k")))
+    t.start()
+    t.join()
+    assert results["b"] is False
+
+    a.release("k")
+    t = threading.Thread(target=lambda: results.update(b=a.try_acquire("k")))
+    t.start()
+    t.join()
+    assert results["b"] is True
+
+
+def test_expired_lease_can_be_taken_over(path):
+    cache = SharedCache(path, lock_ttl=0.2)
+    results = {}
+
+    assert cache.try_acquire("k")
+    time.sleep(0.3)     # holder never released
+
+    t = threading.Thread(target=lambda: results.update(b=cache.try_acquire("k")))
+    t.start()
+    t.join()
+    assert results["b"] is True
+
+
+def test_concurrent_refreshes_call_fetch_once(path):
+    cache = SharedCache(path, lock_ttl=5.0, poll_interval=0.01)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return _frame()
+
+    out = []
+    threads = [
+        threading.Thread(target=lambda: out.append(cache.get_or_refresh_candles("k", 1, fetch)))
+        for _ in range(6)
+    ]
+    [t.start() for t in threads]
+    [t.join() for t in threads]
+
+    assert len(calls) == 1
+    assert all(len(df) == 3 for df in out)
+
+
+# =========
+# Expiry
+# =========
+
+def test_entries_expire_with_the_bar(path):
+    cache = SharedCache(path)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return _frame()
+
+    cache.get_or_refresh_candles("k", 1, fetch)
+    cache.get_or_refresh_candles("k", 1, fetch)
+    assert len(calls) == 1
+
+    cache.get_or_refresh_candles("k", 2, fetch)     # next bar opened
+    assert len(calls) == 2
+
+
+def test_incomplete_entries_only_live_for_stale_ttl(path):
+    cache = SharedCache(path, stale_ttl=0.2)
+    calls = []
+
+    def evaluate():
+        calls.append(1)
+        return {"n": len(calls)}
+
+    incomplete = dict(evaluate=evaluate, is_complete=lambda d: False)
+
+    assert cache.get_or_refresh_decision("k", 1, **incomplete) == {"n": 1}
+    assert cache.get_or_refresh_decision("k", 1, **incomplete) == {"n": 1}
+
+    time.sleep(0.3)
+    assert cache.get_or_refresh_decision("k", 1, evaluate) == {"n": 2}
+
+    time.sleep(0.3)     # complete entries ignore the stale TTL
+    assert cache.get_or_refresh_decision("k", 1, evaluate) == {"n": 2}
+
+
+def test_candles_round_trip(path):
+    cache = SharedCache(path)
+    df = _frame(5)
+    cache.put_candles("k", 1, df)
+
+    pd.testing.assert_frame_equal(cache.get_candles("k", 1), df, check_freq=False)
+    assert cache.get_candles("k", 2) is None
@@ -0,0 +1,45 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import decision as decision_module
+from app.core.shared_cache import SharedCache
+from app.main import app
+
+
+@pytest.fixture
+def evaluations(tmp_path, monkeypatch):
+    cache = SharedCache(str(tmp_path / "cache.sqlite3"), stale_ttl=60.0)
+    calls = []
+
+    def evaluate_signal(market_data, **kwargs):
+        calls.append(kwargs["symbol"])
+        return {"trade_allowed": False, "reason": "No valid structure zone"}
+
+    monkeypatch.setattr(decision_module, "get_shared_cache", lambda: cache)
+    monkeypatch.setattr(decision_module, "evaluate_signal", evaluate_signal)
+    monkeypatch.setattr(decision_module, "MarketDataService", lambda: None)
+    return calls
+
+
+def test_conditional_request_is_answered_without_evaluation(evaluations):
+    client = TestClient(app)
+
+    first = client.get("/signal/")
+    assert first.status_code == 200
+    assert first.json() == {"trade_allowed": False, "reason": "No valid structure zone"}
+
+    again = client.get("/signal/", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert again.status_code == 304
+    assert again.headers["ETag"] == first.headers["ETag"]
+    assert evaluations == ["EUR/USD"]
+
+
+def test_etag_depends_on_the_decision_only():
+    decision = {"trade_allowed": False, "reason": "x"}
+
+    a = decision_module._entry(decision, "EUR/USD", "DXY", ["15m"])
+    b = decision_module._entry(dict(decision), "EUR/USD", "DXY", ["15m"])
+    c = decision_module._entry({**decision, "reason": "y"}, "EUR/USD", "DXY", ["15m"])
+
+    assert a["etag"] == b["etag"] != c["etag"]
@@ -0,0 +1,124 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.core import market_data as market_data_module
+from app.core.market_data import MarketDataService
+from app.core.ring_buffer import OHLCV_COLUMNS, CandleStore
+from app.core.state import (
+    DecisionHistory,
+    StateManager,
+    restore_snapshot,
+    worker_snapshot_path,
+    write_snapshot,
+)
+from app.strategy.structure import StructureZone
+from app.strategy.zone_index import ZoneIndex
+
+
+SYMBOL = "EUR/USD"
+
+
+def _frame(start: pd.Timestamp, rows: int, freq: str = "15min") -> pd.DataFrame:
+    index = pd.date_range(start, periods=rows, freq=freq, name="timestamp", unit="ns")
+    closes = np.arange(rows, dtype="float64")
+    return pd.DataFrame({name: closes for name in OHLCV_COLUMNS}, index=index)
+
+
+def _state(capacity: int = 10):
+    return CandleStore(capacity), ZoneIndex(max_age=None), DecisionHistory()
+
+
+# =========
+# Snapshots
+# =========
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    store, zones, history = _state()
+    store.ingest(SYMBOL, "15m", _frame(pd.Timestamp("2024-01-01"), 12))
+    zone = StructureZone(
+        direction="bullish", lower=1.0, upper=1.1,
+        bos_index=3, failure_index=5, timeframe="15m",
+    )
+    zones.add(SYMBOL, zone, timestamp=1)
+    history.append("k", {"trade_allowed": False}, timestamp=1.0)
+
+    write_snapshot(path, store, zones, history)
+
+    restored = _state()
+    restore_snapshot(path, *restored)
+
+    pd.testing.assert_frame_equal(
+        restored[0].frame(SYMBOL, "15m"), store.frame(SYMBOL, "15m")
+    )
+    assert [(r.zone_id, r.lower, r.upper) for r in restored[1].records()] == [(1, 1.0, 1.1)]
+    assert restored[2].items() == history.items()
+
+
+def test_worker_snapshots_merge_newest_bars(tmp_path):
+    base = str(tmp_path / "snapshot.bin")
+    t0 = pd.Timestamp("2024-01-01")
+
+    for pid, rows in [(1, 6), (2, 8)]:
+        store, zones, history = _state()
+        store.ingest(SYMBOL, "15m", _frame(t0, rows))
+        history.append("k", {"worker": pid}, timestamp=float(pid))
+        write_snapshot(worker_snapshot_path(base, pid), store, zones, history)
+        time.sleep(0.01)    # restore order follows mtime
+
+    store, zones, history = _state()
+    StateManager(base, store=store, zone_index=zones, history=history).restore()
+
+    assert len(store.frame(SYMBOL, "15m")) == 8
+    assert [item["decision"]["worker"] for item in history.items()] == [1, 2]
+
+
+def test_history_is_not_duplicated_across_restarts(tmp_path):
+    base = str(tmp_path / "snapshot.bin")
+    store, zones, history = _state()
+    history.append("k", {"n": 1}, timestamp=1.0)
+    history.append("k", {"n": 2}, timestamp=2.0)
+
+    # Each generation restores the previous one and snapshots again
+    for generation in range(3):
+        path = worker_snapshot_path(base, 100 + generation)
+        write_snapshot(path, store, zones, history)
+
+        store, zones, history = _state()
+        StateManager(base, store=store, zone_index=zones, history=history).restore()
+
+    assert [item["decision"]["n"] for item in history.items()] == [1, 2]
+
+
+# =========
+# Delta refresh after restore
+# =========
+
+class _CountingProvider:
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.counts = []
+
+    def fetch_ohlcv(self, instrument: str, granularity: str, count: int) -> pd.DataFrame:
+        self.counts.append(count)
+        return self.df.iloc[-count:]
+
+
+def test_warm_buffer_publishes_full_series_after_delta_fetch(monkeypatch):
+    store = CandleStore(50)
+    monkeypatch.setattr(market_data_module, "get_candle_store", lambda: store)
+
+    now = pd.Timestamp(time.time(), unit="s").floor("15min")
+    full = _frame(now - pd.Timedelta(minutes=15 * 52), 53)
+    store.ingest(SYMBOL, "15m", full.iloc[:-3])     # restored, 3 bars behind
+
+    service = MarketDataService.__new__(MarketDataService)
+    service.provider = _CountingProvider(full)
+
+    df = service._fetch_full(SYMBOL, "15m", 50)
+
+    assert service.provider.counts[0] < 10
+    assert len(service.provider.counts) == 1
+    pd.testing.assert_frame_equal(df, full.iloc[-50:], check_freq=False)
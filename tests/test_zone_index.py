@@ -0,0 +1,191 @@
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from app.core.decision import evaluate_signal
+from app.core.market_data import MarketDataService
+from app.strategy.structure import StructureResult, StructureZone
+from app.strategy.zone_index import (
+    ZONE_CREATED,
+    ZONE_INVALIDATED,
+    ZONE_RETESTED,
+    ZoneIndex,
+)
+
+
+SYMBOL = "EUR/USD"
+HOUR_NS = 60 * 60 * 1_000_000_000
+T0 = pd.Timestamp("2024-01-01").value
+
+
+def bullish_zone(lower: float = 1.0, upper: float = 1.1, timeframe: str = "15m") -> StructureZone:
+    return StructureZone(
+        direction="bullish",
+        lower=lower,
+        upper=upper,
+        bos_index=10,
+        failure_index=12,
+        timeframe=timeframe,
+    )
+
+
+# =========
+# Lifecycle
+# =========
+
+def test_retest_is_counted_once_per_bar():
+    index = ZoneIndex()
+    record = index.add(SYMBOL, bullish_zone(), timestamp=T0)
+    assert record.state == ZONE_CREATED
+
+    for _ in range(3):  # same forming bar polled three times
+        index.on_bar(SYMBOL, high=1.2, low=1.05, close=1.15, timestamp=T0 + HOUR_NS)
+
+    assert record.state == ZONE_RETESTED
+    assert record.retests == 1
+
+    index.on_bar(SYMBOL, high=1.2, low=1.05, close=1.15, timestamp=T0 + 2 * HOUR_NS)
+    assert record.retests == 2
+
+
+def test_forming_bar_wick_beyond_invalidates_only_once_closed():
+    index = ZoneIndex()
+    record = index.add(SYMBOL, bullish_zone(), timestamp=T0)
+    bar = T0 + HOUR_NS
+
+    # First poll: the bar trades into the zone and closes inside it
+    index.on_bar(SYMBOL, high=1.12, low=1.05, close=1.08, timestamp=bar, closed=False)
+    assert record.state == ZONE_RETESTED
+
+    # Later poll of the SAME forming bar: it trades below the far edge
+    index.on_bar(SYMBOL, high=1.12, low=0.95, close=0.97, timestamp=bar, closed=False)
+    assert record.state == ZONE_RETESTED
+    assert record.retests == 1
+
+    # The bar closes beyond the far edge
+    index.on_bar(SYMBOL, high=1.12, low=0.95, close=0.97, timestamp=bar)
+
+    assert record.state == ZONE_INVALIDATED
+    assert record.invalidated_at == bar
+    assert index.active(SYMBOL) == []
+    assert index.penetrated(SYMBOL, 1.0, 1.1) == []
+
+
+def test_forming_bar_wick_beyond_that_recovers_keeps_zone():
+    index = ZoneIndex()
+    record = index.add(SYMBOL, bullish_zone(), timestamp=T0)
+    bar = T0 + HOUR_NS
+
+    index.on_bar(SYMBOL, high=1.12, low=0.95, close=0.97, timestamp=bar, closed=False)
+    index.on_bar(SYMBOL, high=1.12, low=0.95, close=1.08, timestamp=bar)
+
+    assert record.state == ZONE_RETESTED
+    assert index.active(SYMBOL) == [record]
+
+
+def test_readding_invalidated_zone_keeps_it_invalidated():
+    index = ZoneIndex()
+    zone = bullish_zone()
+    record = index.add(SYMBOL, zone, timestamp=T0)
+    index.on_bar(SYMBOL, high=1.05, low=0.9, close=0.95, timestamp=T0 + HOUR_NS)
+
+    again = index.add(SYMBOL, zone, timestamp=T0 + 2 * HOUR_NS)
+
+    assert again is record
+    assert again.state == ZONE_INVALIDATED
+
+
+def test_untouched_zones_expire():
+    index = ZoneIndex(max_age=24 * 60 * 60)
+    old = index.add(SYMBOL, bullish_zone(1.0, 1.1), timestamp=T0)
+    recent = index.add(SYMBOL, bullish_zone(2.0, 2.1), timestamp=T0 + 20 * HOUR_NS)
+
+    # A bar far from both zones, 25h after the first one was created
+    index.on_bar(SYMBOL, high=3.0, low=2.9, close=2.95, timestamp=T0 + 25 * HOUR_NS)
+
+    assert index.get(old.zone_id) is None
+    assert [r.zone_id for r in index.active(SYMBOL)] == [recent.zone_id]
+    assert index.add(SYMBOL, bullish_zone(1.0, 1.1)).zone_id != old.zone_id
+
+
+def test_retest_postpones_expiry():
+    index = ZoneIndex(max_age=24 * 60 * 60)
+    record = index.add(SYMBOL, bullish_zone(1.0, 1.1), timestamp=T0)
+
+    index.on_bar(SYMBOL, high=1.05, low=1.04, close=1.05, timestamp=T0 + 20 * HOUR_NS)
+    index.on_bar(SYMBOL, high=3.0, low=2.9, close=2.95, timestamp=T0 + 30 * HOUR_NS)
+    assert index.get(record.zone_id) is record
+
+    index.on_bar(SYMBOL, high=3.0, low=2.9, close=2.95, timestamp=T0 + 45 * HOUR_NS)
+    assert index.get(record.zone_id) is None
+
+
+# =========
+# Decision gating
+# =========
+
+class _StubMarketData(MarketDataService):
+    """
+    Fixed structures and candles; never touches a provider.
+    """
+
+    def __init__(self, zone: StructureZone, candles: pd.DataFrame):
+        self.zone = zone
+        self.candles = candles
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str, limit: int = 300) -> pd.DataFrame:
+        return self.candles.iloc[-limit:]
+
+    def fetch_entry_frame(self, symbol: str, timeframe: str, limit: int = 300) -> pd.DataFrame:
+        return self.fetch_ohlcv(symbol, timeframe, limit)
+
+    def evaluate_structure_multi_tf(
+        self,
+        symbol: str,
+        timeframes: List[str],
+        failure_validator: Callable,
+        swing_lookback: int = 3,
+    ) -> Dict[str, StructureResult]:
+        if symbol != SYMBOL:
+            # Index (DXY) bearish: confirms a bullish EUR/USD
+            return {tf: StructureResult(True, "bearish", None, None) for tf in timeframes}
+
+        return {
+            tf: StructureResult(True, "bullish", _on_timeframe(self.zone, tf), None)
+            for tf in timeframes
+        }
+
+
+def _on_timeframe(zone: StructureZone, timeframe: str) -> StructureZone:
+    return StructureZone(**{**vars(zone), "timeframe": timeframe})
+
+
+def _candles(close: float) -> pd.DataFrame:
+    index = pd.date_range("2024-01-01", periods=3, freq="15min", name="timestamp")
+    return pd.DataFrame(
+        {"open": close, "high": close + 0.01, "low": close - 0.01, "close": close, "volume": 0.0},
+        index=index,
+    )
+
+
+def test_zone_gate_uses_current_structure_not_remembered_zones():
+    index = ZoneIndex()
+    timeframes = ["1h", "30m", "15m"]
+
+    # Earlier evaluation registered an active bullish zone far from price
+    index.add(SYMBOL, bullish_zone(5.0, 5.1, "15m"), timestamp=T0)
+
+    # The current structures carry an invalidated zone only
+    current = bullish_zone(1.0, 1.1)
+    for tf in timeframes:
+        record = index.add(SYMBOL, _on_timeframe(current, tf), T0)
+        index.invalidate(record.zone_id, T0)
+
+    decision = evaluate_signal(
+        _StubMarketData(current, _candles(2.0)),
+        symbol=SYMBOL,
+        timeframes=timeframes,
+        zone_index=index,
+    )
+
+    assert decision == {"trade_allowed": False, "reason": "No valid structure zone"}